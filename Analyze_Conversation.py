@@ -8,39 +8,16 @@ from langchain.schema import HumanMessage, SystemMessage
 from utils import format_conversation_with_roles
 from config import CONVERSATION_ANALYSIS_CONFIG
 
-def analyze_conversation_with_roles(conversation_text: str, roles: dict, duration_seconds: float, is_valid_call: bool) -> dict:
-    """
-    使用LLM对通话记录进行分析，并给出改进建议
-    
-    Args:
-        conversation_text: 对话文本
-        roles: 角色识别结果
-        duration_seconds: 通话时长（秒）
-        is_valid_call: 是否为有效通话（时长>=60秒）
-        
-    Returns:
-        Dict: 分析结果
-    """
-    formatted_text = format_conversation_with_roles(conversation_text, roles)
-    
-    # 确保占位符正确替换
-    formatted_text = formatted_text.replace("{ROLES_SPK1}", roles["spk1"])
-    formatted_text = formatted_text.replace("{ROLES_SPK2}", roles["spk2"])
-    
-    confidence_warning = ""
-    if roles.get("confidence", "low") == "low":
-        confidence_warning = " (注意: 系统对说话者角色的识别可信度较低，建议人工核实)"
-    
-    # 构建通话有效性说明
-    validity_status = f"【有效通话】（时长：{duration_seconds:.2f}秒）" if is_valid_call else f"【无效通话】（时长：{duration_seconds:.2f}秒，不足1分钟）"
-    
-    system_prompt = f"""
+# 固定的评分标准和输出格式，与具体通话无关。
+# 各次请求的系统提示词以完全相同的内容开头，可以命中模型服务端的提示词前缀缓存，
+# 每通电话不同的角色、时长等信息放在其后（见analyze_conversation_with_roles）
+_ANALYSIS_SYSTEM_PROMPT = """
     你是一位专业的销售通话分析专家，负责对润滑油（如壳牌、海德力等品牌）销售对话进行分析评估。
     请忽略对话转写中的同音别字（如"壳牌"变成"翘牌"/"撬环"等），并理解销售与客户角色可能存在少量混淆。专注于核心对话内容。
-    以下是对话记录，其中 {roles['spk1']} 是"销售"，{roles['spk2']} 是"客户"。
+    对话记录中说话者的角色（谁是"销售"、谁是"客户"）见最后的"本次通话信息"。
 
     **⚠️ 重要约束：**
-    1. **时间显示要求**：通话时长已确定为 {duration_seconds:.2f} 秒，请在分析中使用这个精确数值，绝对禁止使用"约"、"大概"、"大约"等模糊词汇！
+    1. **时间显示要求**：通话时长已确定（见"本次通话信息"），请在分析中使用这个精确数值，绝对禁止使用"约"、"大概"、"大约"等模糊词汇！
     2. **完整分析要求**：无论对话长短，都必须按照完整的评分维度进行分析。即使是短对话，也要尽可能从现有内容中提取信息并给出建设性的改进建议。绝对不要输出"对话内容过短，无法展开有效分析"这样的内容。
 
     ### **分析流程与评分标准**
@@ -65,7 +42,7 @@ def analyze_conversation_with_roles(conversation_text: str, roles: dict, duratio
     ```markdown
     ### 销售对话分析报告
 
-    **通话状态**: {validity_status}
+    **通话状态**: [照抄"本次通话信息"中给出的通话状态]
     **总分**: XX分 / 100分
 
     ---
@@ -117,6 +94,41 @@ def analyze_conversation_with_roles(conversation_text: str, roles: dict, duratio
     - **话术示范** (可选): "[示范沟通话术]"
     ```
     """
+
+def analyze_conversation_with_roles(conversation_text: str, roles: dict, duration_seconds: float, is_valid_call: bool) -> dict:
+    """
+    使用LLM对通话记录进行分析，并给出改进建议
+    
+    Args:
+        conversation_text: 对话文本
+        roles: 角色识别结果
+        duration_seconds: 通话时长（秒）
+        is_valid_call: 是否为有效通话（时长>=60秒）
+        
+    Returns:
+        Dict: 分析结果
+    """
+    formatted_text = format_conversation_with_roles(conversation_text, roles)
+    
+    # 确保占位符正确替换
+    formatted_text = formatted_text.replace("{ROLES_SPK1}", roles["spk1"])
+    formatted_text = formatted_text.replace("{ROLES_SPK2}", roles["spk2"])
+    
+    confidence_warning = ""
+    if roles.get("confidence", "low") == "low":
+        confidence_warning = " (注意: 系统对说话者角色的识别可信度较低，建议人工核实)"
+    
+    # 构建通话有效性说明
+    validity_status = f"【有效通话】（时长：{duration_seconds:.2f}秒）" if is_valid_call else f"【无效通话】（时长：{duration_seconds:.2f}秒，不足1分钟）"
+    
+    # 本次通话的信息追加在固定前缀之后，不影响前缀缓存
+    system_prompt = _ANALYSIS_SYSTEM_PROMPT + f"""
+    ### **本次通话信息**
+
+    - 对话记录中 {roles['spk1']} 是"销售"，{roles['spk2']} 是"客户"。
+    - 通话时长：{duration_seconds:.2f} 秒
+    - 通话状态：{validity_status}
+    """
     
     llm = ChatOpenAI(
         openai_api_key=CONVERSATION_ANALYSIS_CONFIG["api_key"],
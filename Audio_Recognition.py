@@ -396,6 +396,57 @@ def process_transcription_result(result_json: Dict[str, Any]) -> Dict[str, Any]:
     
     return processed_result
 
+def format_transcription_text(result_json: Dict[str, Any]) -> str:
+    """
+    将转写结果整理为txt文本（完整文本、分句信息、音频信息和讯飞格式的对话）
+    
+    Args:
+        result_json: 转写结果JSON
+        
+    Returns:
+        str: 整理后的文本
+    """
+    parts = []
+    # 写入完整文本
+    if 'result' in result_json and 'text' in result_json['result']:
+        parts.append("【完整文本】\n")
+        parts.append(result_json['result']['text'])
+        parts.append("\n\n")
+    
+    # 写入分句和说话人信息
+    if 'result' in result_json and 'utterances' in result_json['result']:
+        parts.append("【分句信息】\n")
+        for i, utterance in enumerate(result_json['result']['utterances']):
+            speaker = utterance.get('additions', {}).get('speaker', '未知')
+            start_time = utterance.get('start_time', 0) / 1000  # 毫秒转秒
+            end_time = utterance.get('end_time', 0) / 1000
+            text = utterance.get('text', '')
+            
+            parts.append(f"说话人 {speaker} [{start_time:.2f}s-{end_time:.2f}s]: {text}\n")
+    
+    # 写入音频信息（使用改进的时长提取逻辑）
+    parts.append("\n【音频信息】\n")
+    duration_seconds = extract_duration_from_result(result_json)
+    parts.append(f"总时长: {duration_seconds:.2f}秒\n")
+    
+    # 添加讯飞格式的转写结果用于LLM处理
+    if 'result' in result_json and 'utterances' in result_json['result']:
+        speakers = {}
+        # 先将说话人ID映射到说话人序号（spk1, spk2）
+        for utterance in result_json['result']['utterances']:
+            speaker_id = utterance.get('additions', {}).get('speaker', '1')
+            if speaker_id not in speakers:
+                speakers[speaker_id] = f"spk{len(speakers) + 1}"
+        
+        # 生成讯飞API兼容格式
+        for utterance in result_json['result']['utterances']:
+            speaker_id = utterance.get('additions', {}).get('speaker', '1')
+            spk_prefix = speakers.get(speaker_id, "spk1")
+            text = utterance.get('text', '')
+            parts.append(f"{spk_prefix}##{text}\n")
+    
+    return "".join(parts)
+
 def save_to_txt(result_json: Dict[str, Any], output_file: str) -> None:
     """
     将转写结果保存为txt文件
@@ -405,43 +456,7 @@ def save_to_txt(result_json: Dict[str, Any], output_file: str) -> None:
         output_file: 输出文件路径
     """
     with open(output_file, 'w', encoding='utf-8') as f:
-        # 写入完整文本
-        if 'result' in result_json and 'text' in result_json['result']:
-            f.write("【完整文本】\n")
-            f.write(result_json['result']['text'])
-            f.write("\n\n")
-        
-        # 写入分句和说话人信息
-        if 'result' in result_json and 'utterances' in result_json['result']:
-            f.write("【分句信息】\n")
-            for i, utterance in enumerate(result_json['result']['utterances']):
-                speaker = utterance.get('additions', {}).get('speaker', '未知')
-                start_time = utterance.get('start_time', 0) / 1000  # 毫秒转秒
-                end_time = utterance.get('end_time', 0) / 1000
-                text = utterance.get('text', '')
-                
-                f.write(f"说话人 {speaker} [{start_time:.2f}s-{end_time:.2f}s]: {text}\n")
-        
-        # 写入音频信息（使用改进的时长提取逻辑）
-        f.write("\n【音频信息】\n")
-        duration_seconds = extract_duration_from_result(result_json)
-        f.write(f"总时长: {duration_seconds:.2f}秒\n")
-        
-        # 添加讯飞格式的转写结果用于LLM处理
-        if 'result' in result_json and 'utterances' in result_json['result']:
-            speakers = {}
-            # 先将说话人ID映射到说话人序号（spk1, spk2）
-            for utterance in result_json['result']['utterances']:
-                speaker_id = utterance.get('additions', {}).get('speaker', '1')
-                if speaker_id not in speakers:
-                    speakers[speaker_id] = f"spk{len(speakers) + 1}"
-            
-            # 生成讯飞API兼容格式
-            for utterance in result_json['result']['utterances']:
-                speaker_id = utterance.get('additions', {}).get('speaker', '1')
-                spk_prefix = speakers.get(speaker_id, "spk1")
-                text = utterance.get('text', '')
-                f.write(f"{spk_prefix}##{text}\n")
+        f.write(format_transcription_text(result_json))
 
 def extract_duration_from_result(result_json: Dict[str, Any]) -> float:
     """
@@ -717,14 +732,12 @@ async def process_file(file_path: str) -> Dict[str, Any]:
         file_name = os.path.basename(file_path)
         output_file_path = f"{file_name}_output.txt"
         
-        # 6. 保存处理后的结果到txt文件
-        save_to_txt(processed_result, output_file_path)
+        # 6. 整理转写文本并保存到txt文件（LLM分析直接使用内存中的文本，无需再从文件读回）
+        conversation_text = format_transcription_text(processed_result)
+        with open(output_file_path, 'w', encoding='utf-8') as f:
+            f.write(conversation_text)
         logging.debug(f"已将转写结果保存至: {output_file_path}")
         
-        # 7. 读取转写文本，准备进行LLM分析
-        with open(output_file_path, 'r', encoding='utf-8') as f:
-            conversation_text = f.read()
-        
         # 7.1 改进的音频时长提取
         duration_seconds = extract_duration_from_result(result_json)
         logging.debug(f"提取到的音频时长: {duration_seconds:.2f}秒")
@@ -751,11 +764,7 @@ async def process_file(file_path: str) -> Dict[str, Any]:
         # 添加转换文件信息到结果中
         if conversion_info:
             result["conversion_info"] = conversion_info
-            # 为了让用户能够验证，暂时不删除转换文件
-            # 改为在结果中标记文件路径，由调用者决定何时清理
-            if conversion_info.get("conversion_success", False):
-                logging.info(f"💾 转换文件已保留供验证: {conversion_info['converted_file_path']}")
-                logging.info(f"⚠️  注意：转换文件将在程序结束时自动清理")
+            # 转换文件与上传文件位于同一临时文件夹，由调用者在分析结束后随文件夹一并删除
         else:
             # 如果没有转换，立即清理临时文件（如果有）
             if temp_converted_file and os.path.exists(temp_converted_file) and temp_converted_file != file_path:
@@ -868,12 +877,13 @@ def convert_aac_to_wav_sync(aac_file_path: str) -> str:
         finally:
             # 清理临时文件
             for temp_file in [temp_aac_path, temp_wav_path]:
-                if os.path.exists(temp_file):
-                    try:
-                        os.remove(temp_file)
-                        logging.debug(f"已清理临时文件: {temp_file}")
-                    except Exception as e:
-                        logging.warning(f"清理临时文件失败: {temp_file}, 错误: {e}")
+                try:
+                    os.remove(temp_file)
+                    logging.debug(f"已清理临时文件: {temp_file}")
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    logging.warning(f"清理临时文件失败: {temp_file}, 错误: {e}")
         
     except Exception as e:
         error_msg = f"转换AAC文件失败: {str(e)}"
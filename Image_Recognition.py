@@ -11,7 +11,7 @@ from datetime import datetime, date
 from typing import List, Dict, Any, Optional, Tuple
 import openai
 from config import IMAGE_RECOGNITION_CONFIG
-from image_utils import optimize_image_for_llm, encode_image_to_base64, validate_image_format
+from image_utils import optimize_image_for_llm, optimize_images_batch, encode_image_to_base64, validate_image_format
 
 logger = logging.getLogger(__name__)
 
@@ -158,20 +158,25 @@ def parse_call_date(call_time_text: str, current_year: int = None) -> Optional[s
         logger.warning(f"解析日期失败: {call_time_text}, 错误: {e}")
         return None
 
-async def extract_call_info_from_image(image_content: bytes, filename: str) -> Dict[str, Any]:
+async def extract_call_info_from_image(image_content: bytes, filename: str,
+                                       optimize: bool = True) -> Dict[str, Any]:
     """
     从单张图片中提取通话信息
     
     Args:
         image_content: 图片字节数据
         filename: 图片文件名
+        optimize: 是否需要优化图片，image_content已经过优化时传False
     
     Returns:
         提取结果字典
     """
     try:
         # 优化图片
-        optimized_content = optimize_image_for_llm(image_content)
+        if optimize:
+            optimized_content = optimize_image_for_llm(image_content)
+        else:
+            optimized_content = image_content
         base64_image = encode_image_to_base64(optimized_content)
         
         # 创建客户端
@@ -284,21 +289,28 @@ async def process_image_batch(uploaded_images: List[Any], progress_callback=None
     
     logger.info(f"开始批量处理 {total_images} 张图片")
     
-    # 创建异步任务
-    tasks = []
+    # 验证图片格式
+    valid_images = []
     for i, image_file in enumerate(uploaded_images):
-        # 验证图片格式
-        is_valid, error_msg = validate_image_format(image_file)
+        is_valid, error_msg, pil_image = validate_image_format(image_file)
         if not is_valid:
             failed_results.append({
                 "filename": image_file.name,
                 "error": error_msg
             })
             continue
-        
-        # 创建处理任务
-        image_content = image_file.getvalue()
-        task = extract_call_info_from_image(image_content, image_file.name)
+        valid_images.append((i, image_file, pil_image))
+    
+    # 多线程并行优化所有有效图片
+    optimized_contents = optimize_images_batch(
+        [image_file.getvalue() for _, image_file, _ in valid_images],
+        [pil_image for _, _, pil_image in valid_images]
+    )
+    
+    # 创建异步任务
+    tasks = []
+    for (i, image_file, _), optimized_content in zip(valid_images, optimized_contents):
+        task = extract_call_info_from_image(optimized_content, image_file.name, optimize=False)
         tasks.append((i, task))
     
     # 执行异步处理
@@ -766,6 +778,23 @@ def calculate_similarity(call1: Dict[str, Any], call2: Dict[str, Any]) -> float:
         call1: 新的通话记录（从图片识别）
         call2: 现有的通话记录（从数据库）
     
+    Returns:
+        相似度分数 (0-1)
+    """
+    # 从数据库的analysis_text中提取时长
+    duration2 = extract_duration_from_analysis(call2.get('analysis_text', ''))
+    return _calculate_similarity(call1, call2, duration2)
+
+def _calculate_similarity(call1: Dict[str, Any], call2: Dict[str, Any],
+                          duration2: Optional[int]) -> float:
+    """
+    计算两个通话记录的相似度（现有记录的时长已预先提取）
+    
+    Args:
+        call1: 新的通话记录（从图片识别）
+        call2: 现有的通话记录（从数据库）
+        duration2: 现有记录的通话时长（秒）
+    
     Returns:
         相似度分数 (0-1)
     """
@@ -776,8 +805,6 @@ def calculate_similarity(call1: Dict[str, Any], call2: Dict[str, Any]) -> float:
     )
     
     # 2. 时长相似度 (30%权重)
-    # 从数据库的analysis_text中提取时长
-    duration2 = extract_duration_from_analysis(call2.get('analysis_text', ''))
     duration_sim = calculate_duration_similarity(
         call1.get('duration_seconds'),
         duration2
@@ -816,6 +843,14 @@ def calculate_similarity(call1: Dict[str, Any], call2: Dict[str, Any]) -> float:
     
     return total_similarity
 
+# 时长提取模式（预编译，去重时会对每条现有记录调用）
+_DURATION_SECONDS_PATTERNS = tuple(re.compile(p) for p in (
+    r'时长秒数[:：]\s*(\d+)',      # 匹配 "时长秒数: 74"
+    r'(\d+)\s*秒',                 # 匹配 "74秒"
+    r'通话时长[:：]\s*(\d+)\s*秒',  # 匹配 "通话时长: 74秒"
+))
+_DURATION_CLOCK_PATTERN = re.compile(r'通话时长[:：]\s*(\d{1,2}):(\d{2})')
+
 def extract_duration_from_analysis(analysis_text: str) -> Optional[int]:
     """
     从analysis_text中提取通话时长（秒）
@@ -830,20 +865,13 @@ def extract_duration_from_analysis(analysis_text: str) -> Optional[int]:
         return None
     
     # 尝试匹配各种时长格式
-    patterns = [
-        r'时长秒数[:：]\s*(\d+)',      # 匹配 "时长秒数: 74"
-        r'(\d+)\s*秒',                 # 匹配 "74秒"
-        r'通话时长[:：]\s*(\d+)\s*秒',  # 匹配 "通话时长: 74秒"
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, analysis_text)
+    for pattern in _DURATION_SECONDS_PATTERNS:
+        match = pattern.search(analysis_text)
         if match:
             return int(match.group(1))
     
     # 如果没有直接的秒数，尝试解析时长文本（如 "01:14"）
-    duration_pattern = r'通话时长[:：]\s*(\d{1,2}):(\d{2})'
-    match = re.search(duration_pattern, analysis_text)
+    match = _DURATION_CLOCK_PATTERN.search(analysis_text)
     if match:
         minutes = int(match.group(1))
         seconds = int(match.group(2))
@@ -873,13 +901,19 @@ def smart_duplicate_detection(new_calls: List[Dict[str, Any]],
     
     logger.info(f"🤖 开始智能去重检测: {len(new_calls)} 个新记录, {len(existing_calls)} 个现有记录")
     
+    # 现有记录的时长只需提取一次，避免对每个新记录重复解析analysis_text
+    existing_durations = [
+        extract_duration_from_analysis(existing_call.get('analysis_text', ''))
+        for existing_call in existing_calls
+    ]
+    
     for new_call in new_calls:
         max_similarity = 0
         best_match = None
         
         # 与每个现有记录比较
-        for existing_call in existing_calls:
-            similarity = calculate_similarity(new_call, existing_call)
+        for existing_call, duration2 in zip(existing_calls, existing_durations):
+            similarity = _calculate_similarity(new_call, existing_call, duration2)
             if similarity > max_similarity:
                 max_similarity = similarity
                 best_match = existing_call
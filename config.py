@@ -100,7 +100,11 @@ SUMMARY_ANALYSIS_CONFIG = {
     "api_key": st.secrets["MAIN_API_KEY"],
     "api_base": st.secrets["BASE_URL"],
     "model_name": "gemini-2.5-pro",
-    "temperature": 0.7  # 汇总分析也需要一定的创造性
+    "temperature": 0.7,  # 汇总分析也需要一定的创造性
+    "prompt_version": 1,  # 汇总分析提示词版本，修改Analyze_Summary中的提示词后加1，使旧的缓存结果失效
+    "cache_dir": ".summary_cache",  # 汇总分析结果的磁盘缓存目录
+    "cache_ttl_days": 30,  # 缓存有效期（天），过期的缓存不再使用并会被清理
+    "cache_max_entries": 500  # 最多保留的缓存文件数，超出时删除最早写入的
 }
 
 # 图片识别配置
@@ -3,7 +3,10 @@
 提供通话分析系统的所有数据库操作接口
 """
 import asyncio
+import concurrent.futures
+import contextvars
 import json
+import threading
 from datetime import datetime, date
 from typing import List, Dict, Optional, Tuple, Any, Callable, Awaitable
 import asyncpg
@@ -16,6 +19,11 @@ logger = logging.getLogger(__name__)
 # 设置中国时区
 CHINA_TZ = pytz.timezone('Asia/Shanghai')
 
+# 当前协程上下文中正在进行的事务连接（由DatabaseManager.transaction设置）
+_transaction_connection: contextvars.ContextVar[Optional[asyncpg.Connection]] = contextvars.ContextVar(
+    '_transaction_connection', default=None
+)
+
 
 class DatabaseManager:
     """数据库管理器，处理所有数据库操作"""
@@ -158,7 +166,12 @@ class DatabaseManager:
     
     @asynccontextmanager
     async def acquire(self):
-        """获取数据库连接的上下文管理器"""
+        """获取数据库连接的上下文管理器（处于transaction()中时复用事务所在的连接）"""
+        transaction_conn = _transaction_connection.get()
+        if transaction_conn is not None:
+            yield transaction_conn
+            return
+        
         if self._pool is None:
             await self.initialize()
         
@@ -170,20 +183,35 @@ class DatabaseManager:
             await connection.execute("SET timezone = 'Asia/Shanghai'")
             yield connection
     
-    async def get_salespersons(self) -> List[Dict[str, Any]]:
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        在同一个连接的同一个事务中执行一组数据库操作
+        
+        事务内调用的acquire()都会复用这个连接，全部成功才提交，出现异常时整体回滚
+        """
+        async with self.acquire() as conn:
+            async with conn.transaction():
+                token = _transaction_connection.set(conn)
+                try:
+                    yield conn
+                finally:
+                    _transaction_connection.reset(token)
+    
+    async def get_salespersons(self) -> List[asyncpg.Record]:
         """
         获取所有销售人员列表
         
         Returns:
-            销售人员列表 [{"id": 1, "name": "张三"}, ...]
+            销售人员记录列表，支持按字段名访问 (row['id'], row['name'])，
+            需要序列化时再在调用方转换为dict
         """
         async with self.acquire() as conn:
-            rows = await conn.fetch(
+            return await conn.fetch(
                 "SELECT id, name FROM salespersons ORDER BY name"
             )
-            return [dict(row) for row in rows]
     
-    async def get_salesperson_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+    async def get_salesperson_by_name(self, name: str) -> Optional[asyncpg.Record]:
         """
         根据姓名获取销售人员信息
         
@@ -191,14 +219,13 @@ class DatabaseManager:
             name: 销售人员姓名
             
         Returns:
-            销售人员信息字典，如果不存在返回None
+            销售人员记录（支持按字段名访问），如果不存在返回None
         """
         async with self.acquire() as conn:
-            row = await conn.fetchrow(
+            return await conn.fetchrow(
                 "SELECT id, name FROM salespersons WHERE name = $1",
                 name
             )
-            return dict(row) if row else None
     
     async def check_daily_record_exists(self, salesperson_id: int, upload_date: date) -> bool:
         """
@@ -223,7 +250,7 @@ class DatabaseManager:
             )
             return result
     
-    async def get_daily_record(self, salesperson_id: int, upload_date: date) -> Optional[Dict[str, Any]]:
+    async def get_daily_record(self, salesperson_id: int, upload_date: date) -> Optional[asyncpg.Record]:
         """
         获取指定销售人员在指定日期的记录
         
@@ -232,10 +259,10 @@ class DatabaseManager:
             upload_date: 上传日期
             
         Returns:
-            日常记录信息字典，如果不存在返回None
+            日常记录（支持 record['id'] / record.get(...) 访问），如果不存在返回None
         """
         async with self.acquire() as conn:
-            row = await conn.fetchrow(
+            return await conn.fetchrow(
                 """
                 SELECT id, total_calls, effective_calls, average_score,
                        summary_analysis, improvement_suggestions, 
@@ -245,7 +272,6 @@ class DatabaseManager:
                 """,
                 salesperson_id, upload_date
             )
-            return dict(row) if row else None
     
     async def delete_daily_record_and_details(self, daily_record_id: int):
         """
@@ -853,6 +879,82 @@ def setup_database(config: Dict[str, Any]) -> DatabaseManager:
     return db_manager
 
 
+# 后台数据库事件循环：asyncpg连接池绑定在创建它的事件循环上，
+# 同步接口的所有数据库操作都提交到这个常驻的事件循环中执行，连接池才能跨调用复用
+_db_loop: Optional[asyncio.AbstractEventLoop] = None
+_db_loop_lock = threading.Lock()
+
+# 按连接目标共享的DatabaseManager，只在后台事件循环中访问
+_shared_managers: Dict[Tuple[Any, ...], DatabaseManager] = {}
+_shared_managers_lock: Optional[asyncio.Lock] = None
+
+# 只有连接层面的错误和超时（建立连接超时、语句超时）才说明共享连接池可能已失效，需要丢弃后重试；
+# SQL错误、约束冲突等属于操作本身的问题，直接抛出，不影响其他会话正在使用的连接池。
+# Python 3.11起asyncio.TimeoutError、concurrent.futures.TimeoutError与TimeoutError是同一个类，
+# 等待后台事件循环超时与操作本身超时需要通过future是否已完成来区分
+_CONNECTION_ERRORS = (
+    asyncpg.PostgresConnectionError,
+    asyncpg.InterfaceError,
+    OSError,
+    ConnectionError,
+    asyncio.TimeoutError,
+    concurrent.futures.TimeoutError,
+)
+
+# 等待后台事件循环完成一次数据库操作的最长时间（秒），超时后取消操作，避免Streamlit脚本线程被永久阻塞
+_DB_OPERATION_TIMEOUT = 300
+
+
+def _get_db_loop() -> asyncio.AbstractEventLoop:
+    """获取后台数据库事件循环，首次调用时在守护线程中启动"""
+    global _db_loop
+    with _db_loop_lock:
+        if _db_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="database-event-loop", daemon=True).start()
+            _db_loop = loop
+        return _db_loop
+
+
+def _shared_manager_key(config: Dict[str, Any]) -> Tuple[Any, ...]:
+    """共享连接池的键：同一数据库、同一用户共用一个连接池"""
+    return (config['host'], config['port'], config['database'], config['username'])
+
+
+async def _get_shared_manager(config: Dict[str, Any]) -> DatabaseManager:
+    """
+    获取共享的DatabaseManager，首次使用时创建连接池并检查数据库结构
+    
+    Args:
+        config: 数据库配置
+        
+    Returns:
+        已初始化的数据库管理器实例
+    """
+    global _shared_managers_lock
+    if _shared_managers_lock is None:
+        _shared_managers_lock = asyncio.Lock()
+    
+    key = _shared_manager_key(config)
+    async with _shared_managers_lock:
+        db = _shared_managers.get(key)
+        if db is None:
+            db = DatabaseManager(config)
+            await db.initialize()
+            _shared_managers[key] = db
+    return db
+
+
+async def _discard_shared_manager(config: Dict[str, Any]):
+    """关闭并移除共享的DatabaseManager，下次使用时重新创建连接池"""
+    db = _shared_managers.pop(_shared_manager_key(config), None)
+    if db is not None:
+        try:
+            await db.close()
+        except Exception as e:
+            logger.warning(f"关闭数据库连接池时出错: {e}")
+
+
 # Streamlit专用的同步接口
 class SyncDatabaseManager:
     """为Streamlit提供的同步数据库接口"""
@@ -860,25 +962,35 @@ class SyncDatabaseManager:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         
-    def _run_async(self, coro_factory: Callable[[], Awaitable[Any]]):
-        """在新的事件循环中运行异步代码（带重试机制）"""
-        import asyncio
+    def _run_async(self, operation: Callable[[DatabaseManager], Awaitable[Any]]):
+        """在后台事件循环中使用共享连接池执行数据库操作（带重试机制）"""
         import time
         
         # 重试配置
         max_retries = 3
         retry_delay = 2  # 秒
         
+        loop = _get_db_loop()
         for attempt in range(max_retries):
+            future = asyncio.run_coroutine_threadsafe(self._run_with_shared_db(operation), loop)
             try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
+                return future.result(timeout=_DB_OPERATION_TIMEOUT)
+            except _CONNECTION_ERRORS as e:
+                if not future.done():
+                    # 等待后台事件循环超时：取消仍在执行的操作并直接抛出，不再重试
+                    future.cancel()
+                    logger.error(f"数据库操作超时（{_DB_OPERATION_TIMEOUT} 秒），已取消")
+                    raise
+                if future.exception() is None:
+                    # 等待恰好超时的同时操作已成功完成
+                    return future.result()
+                # 连接可能已经断开，丢弃共享连接池，重试时重新建立
+                discard = asyncio.run_coroutine_threadsafe(_discard_shared_manager(self.config), loop)
                 try:
-                    return loop.run_until_complete(coro_factory())
-                finally:
-                    loop.close()
-                    asyncio.set_event_loop(None)
-            except Exception as e:
+                    discard.result(timeout=_DB_OPERATION_TIMEOUT)
+                except concurrent.futures.TimeoutError:
+                    discard.cancel()
+                    logger.warning("关闭失效的数据库连接池超时")
                 if attempt < max_retries - 1:
                     logger.warning(f"连接失败 (尝试 {attempt + 1}/{max_retries}): {e}")
                     logger.info(f"等待 {retry_delay} 秒后重试...")
@@ -887,27 +999,22 @@ class SyncDatabaseManager:
                     logger.error(f"连接失败，已达最大重试次数: {e}")
                     raise
     
-    def get_salespersons(self) -> List[Dict[str, Any]]:
+    async def _run_with_shared_db(self, operation: Callable[[DatabaseManager], Awaitable[Any]]):
+        """获取共享的DatabaseManager并执行数据库操作（在后台事件循环中运行）"""
+        db = await _get_shared_manager(self.config)
+        return await operation(db)
+    
+    def get_salespersons(self) -> List[asyncpg.Record]:
         """同步获取销售人员列表"""
-        async def _get():
-            db = DatabaseManager(self.config)
-            await db.initialize()
-            try:
-                return await db.get_salespersons()
-            finally:
-                await db.close()
+        async def _get(db):
+            return await db.get_salespersons()
         
         return self._run_async(_get)
     
     def check_daily_record_exists(self, salesperson_id: int, upload_date: date) -> bool:
         """同步检查记录是否存在"""
-        async def _check():
-            db = DatabaseManager(self.config)
-            await db.initialize()
-            try:
-                return await db.check_daily_record_exists(salesperson_id, upload_date)
-            finally:
-                await db.close()
+        async def _check(db):
+            return await db.check_daily_record_exists(salesperson_id, upload_date)
         
         return self._run_async(_check)
     
@@ -918,13 +1025,8 @@ class SyncDatabaseManager:
         days_back: int = 30
     ) -> Dict[str, Any]:
         """同步检测重复文件名"""
-        async def _check():
-            db = DatabaseManager(self.config)
-            await db.initialize()
-            try:
-                return await db.check_duplicate_filenames(salesperson_id, filenames, days_back)
-            finally:
-                await db.close()
+        async def _check(db):
+            return await db.check_duplicate_filenames(salesperson_id, filenames, days_back)
         
         return self._run_async(_check)
     
@@ -935,13 +1037,8 @@ class SyncDatabaseManager:
         record_type: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """同步获取最近的通话记录"""
-        async def _get():
-            db = DatabaseManager(self.config)
-            await db.initialize()
-            try:
-                return await db.get_recent_call_records(salesperson_id, days_back, record_type)
-            finally:
-                await db.close()
+        async def _get(db):
+            return await db.get_recent_call_records(salesperson_id, days_back, record_type)
         
         return self._run_async(_get)
     
@@ -953,9 +1050,7 @@ class SyncDatabaseManager:
         upload_choice: Optional[str] = None
     ) -> bool:
         """同步保存分析数据"""
-        async def _save():
-            db = DatabaseManager(self.config)
-            await db.initialize()
+        async def _save(db):
             try:
                 today = date.today()
                 
@@ -969,188 +1064,192 @@ class SyncDatabaseManager:
                 # 使用局部变量来避免重新赋值问题
                 current_upload_choice = upload_choice
                 
-                # 查询当前数据库中的记录数量（用于对比）
-                async with db.acquire() as conn:
-                    total_records_before = await conn.fetchval("SELECT COUNT(*) FROM daily_call_records")
-                    total_details_before = await conn.fetchval("SELECT COUNT(*) FROM call_details")
-                    logger.info(f"📊 操作前数据库状态:")
-                    logger.info(f"   每日记录总数: {total_records_before}")
-                    logger.info(f"   通话详情总数: {total_details_before}")
-                
-                # 处理现有记录
-                existing_record = await db.get_daily_record(salesperson_id, today)
-                if current_upload_choice == "overwrite" and existing_record:
-                    # 安全检查：确认只删除指定销售人员当天的记录
-                    logger.warning(f"⚠️  准备删除销售人员 {salesperson_id} 在 {today} 的现有记录")
-                    logger.warning(f"   即将删除的记录ID: {existing_record['id']}")
-                    
-                    # 查询将要删除的详情数量
+                # 删除、创建记录和插入详情在同一事务中完成，中途出错时整体回滚
+                async with db.transaction():
+                    # 查询当前数据库中的记录数量（用于对比）
                     async with db.acquire() as conn:
-                        details_to_delete = await conn.fetchval(
-                            "SELECT COUNT(*) FROM call_details WHERE daily_record_id = $1",
-                            existing_record['id']
-                        )
-                    logger.warning(f"   将删除 {details_to_delete} 条通话详情")
+                        total_records_before = await conn.fetchval("SELECT COUNT(*) FROM daily_call_records")
+                        total_details_before = await conn.fetchval("SELECT COUNT(*) FROM call_details")
+                        logger.info(f"📊 操作前数据库状态:")
+                        logger.info(f"   每日记录总数: {total_records_before}")
+                        logger.info(f"   通话详情总数: {total_details_before}")
                     
-                    # 执行删除操作
-                    await db.delete_daily_record_and_details(existing_record['id'])
+                    # 处理现有记录
+                    existing_record = await db.get_daily_record(salesperson_id, today)
+                    if current_upload_choice == "overwrite" and existing_record:
+                        # 安全检查：确认只删除指定销售人员当天的记录
+                        logger.warning(f"⚠️  准备删除销售人员 {salesperson_id} 在 {today} 的现有记录")
+                        logger.warning(f"   即将删除的记录ID: {existing_record['id']}")
+                        
+                        # 查询将要删除的详情数量
+                        async with db.acquire() as conn:
+                            details_to_delete = await conn.fetchval(
+                                "SELECT COUNT(*) FROM call_details WHERE daily_record_id = $1",
+                                existing_record['id']
+                            )
+                        logger.warning(f"   将删除 {details_to_delete} 条通话详情")
+                        
+                        # 执行删除操作
+                        await db.delete_daily_record_and_details(existing_record['id'])
+                        
+                        # 验证删除后的状态
+                        async with db.acquire() as conn:
+                            total_records_after_delete = await conn.fetchval("SELECT COUNT(*) FROM daily_call_records")
+                            total_details_after_delete = await conn.fetchval("SELECT COUNT(*) FROM call_details")
+                            logger.info(f"✅ 删除后数据库状态:")
+                            logger.info(f"   每日记录总数: {total_records_after_delete} (减少: {total_records_before - total_records_after_delete})")
+                            logger.info(f"   通话详情总数: {total_details_after_delete} (减少: {total_details_before - total_details_after_delete})")
+                        
+                        # 安全检查：确认删除的数量合理
+                        if (total_records_before - total_records_after_delete) > 1:
+                            logger.error(f"❌ 异常：删除了超过1条每日记录！")
+                            raise Exception("删除操作异常：删除的记录数量超出预期")
+                        
+                        existing_record = None  # 重置现有记录状态
                     
-                    # 验证删除后的状态
-                    async with db.acquire() as conn:
-                        total_records_after_delete = await conn.fetchval("SELECT COUNT(*) FROM daily_call_records")
-                        total_details_after_delete = await conn.fetchval("SELECT COUNT(*) FROM call_details")
-                        logger.info(f"✅ 删除后数据库状态:")
-                        logger.info(f"   每日记录总数: {total_records_after_delete} (减少: {total_records_before - total_records_after_delete})")
-                        logger.info(f"   通话详情总数: {total_details_after_delete} (减少: {total_details_before - total_details_after_delete})")
+                    # 获取或创建日常记录
+                    if existing_record and current_upload_choice == "append":
+                        daily_record_id = existing_record['id']
+                        logger.info(f"📝 使用现有记录 (追加模式): ID {daily_record_id}")
+                    elif existing_record and current_upload_choice is None:
+                        # 如果存在记录但没有指定操作模式，默认使用追加模式
+                        daily_record_id = existing_record['id']
+                        logger.info(f"📝 使用现有记录 (默认追加模式): ID {daily_record_id}")
+                        current_upload_choice = "append"  # 设置为追加模式以便后续逻辑处理
+                    else:
+                        # 创建新记录（没有现有记录或覆盖模式删除后）
+                        daily_record_id = await db.create_daily_record(salesperson_id, today)
+                        logger.info(f"📝 创建新记录: ID {daily_record_id}")
+                        # 如果是新创建的记录，重新获取完整信息以便后续使用
+                        if current_upload_choice == "append":
+                            # 追加模式但没有现有记录的情况不应该发生，记录警告
+                            logger.warning("⚠️  追加模式但没有找到现有记录，创建了新记录")
+                            existing_record = None
                     
-                    # 安全检查：确认删除的数量合理
-                    if (total_records_before - total_records_after_delete) > 1:
-                        logger.error(f"❌ 异常：删除了超过1条每日记录！")
-                        raise Exception("删除操作异常：删除的记录数量超出预期")
+                    # 准备批量插入的数据（单次遍历同时统计有效通话数和评分）
+                    total_calls = len(call_details_list)
+                    effective_calls = 0
+                    score_sum = 0.0
+                    score_count = 0
+                    for detail in call_details_list:
+                        effective_calls += bool(detail.get('is_effective', False))
+                        score = detail.get('score')
+                        if score is not None:
+                            score_sum += score
+                            score_count += 1
+
+                    logger.info(f"📈 统计信息:")
+                    logger.info(f"   总通话数: {total_calls}")
+                    logger.info(f"   有效通话数: {effective_calls}")
+                    logger.info(f"   有评分通话数: {score_count}")
+
+                    # 批量插入通话详情
+                    if call_details_list:
+                        await db.batch_insert_call_details(
+                            daily_record_id,
+                            salesperson_id,
+                            call_details_list
+                        )
+                        logger.info(f"✅ 成功插入 {len(call_details_list)} 条通话详情")
                     
-                    existing_record = None  # 重置现有记录状态
-                
-                # 获取或创建日常记录
-                if existing_record and current_upload_choice == "append":
-                    daily_record_id = existing_record['id']
-                    logger.info(f"📝 使用现有记录 (追加模式): ID {daily_record_id}")
-                elif existing_record and current_upload_choice is None:
-                    # 如果存在记录但没有指定操作模式，默认使用追加模式
-                    daily_record_id = existing_record['id']
-                    logger.info(f"📝 使用现有记录 (默认追加模式): ID {daily_record_id}")
-                    current_upload_choice = "append"  # 设置为追加模式以便后续逻辑处理
-                else:
-                    # 创建新记录（没有现有记录或覆盖模式删除后）
-                    daily_record_id = await db.create_daily_record(salesperson_id, today)
-                    logger.info(f"📝 创建新记录: ID {daily_record_id}")
-                    # 如果是新创建的记录，重新获取完整信息以便后续使用
-                    if current_upload_choice == "append":
-                        # 追加模式但没有现有记录的情况不应该发生，记录警告
-                        logger.warning("⚠️  追加模式但没有找到现有记录，创建了新记录")
-                        existing_record = None
-                
-                # 准备批量插入的数据
-                total_calls = len(call_details_list)
-                effective_calls = sum(1 for detail in call_details_list if detail.get('is_effective', False))
-                scores = [detail['score'] for detail in call_details_list if detail.get('score') is not None]
-                
-                logger.info(f"📈 统计信息:")
-                logger.info(f"   总通话数: {total_calls}")
-                logger.info(f"   有效通话数: {effective_calls}")
-                logger.info(f"   有评分通话数: {len(scores)}")
-                
-                # 转换数据格式（JSON序列化）
-                for detail in call_details_list:
-                    # 移除错误的score字段序列化，score是数值字段
-                    pass
-                
-                # 批量插入通话详情
-                if call_details_list:
-                    await db.batch_insert_call_details(
-                        daily_record_id,
-                        salesperson_id,
-                        call_details_list
-                    )
-                    logger.info(f"✅ 成功插入 {len(call_details_list)} 条通话详情")
-                
-                # 计算平均分
-                average_score = sum(scores) / len(scores) if scores else None
-                logger.info(f"📊 平均评分: {average_score:.2f}" if average_score else "📊 平均评分: 无")
-                
-                # 从汇总分析中提取改进建议
-                from extract_utils import extract_all_summary_data
-                summary_data = extract_all_summary_data(summary_analysis)
-                improvement_suggestions = "\n".join(summary_data["improvement_measures"]) if summary_data["improvement_measures"] else None
-                
-                # 如果是追加模式，需要合并统计数据
-                if existing_record and current_upload_choice == "append":
-                    logger.info(f"🔄 追加模式：合并统计数据")
-                    logger.info(f"   existing_record ID: {existing_record.get('id')}")
-                    logger.info(f"   daily_record_id: {daily_record_id}")
+                    # 计算平均分
+                    average_score = score_sum / score_count if score_count else None
+                    logger.info(f"📊 平均评分: {average_score:.2f}" if average_score else "📊 平均评分: 无")
                     
-                    old_total = existing_record.get('total_calls', 0)
-                    old_effective = existing_record.get('effective_calls', 0)
-                    old_avg = existing_record.get('average_score')
+                    # 从汇总分析中提取改进建议
+                    from extract_utils import extract_all_summary_data
+                    summary_data = extract_all_summary_data(summary_analysis)
+                    improvement_suggestions = "\n".join(summary_data["improvement_measures"]) if summary_data["improvement_measures"] else None
                     
-                    logger.info(f"   原有数据: {old_total} 通话, {old_effective} 有效, 平均分 {old_avg}")
-                    logger.info(f"   新增数据: {len(call_details_list)} 通话, {effective_calls} 有效")
+                    # 如果是追加模式，需要合并统计数据
+                    if existing_record and current_upload_choice == "append":
+                        logger.info(f"🔄 追加模式：合并统计数据")
+                        logger.info(f"   existing_record ID: {existing_record.get('id')}")
+                        logger.info(f"   daily_record_id: {daily_record_id}")
+                        
+                        old_total = existing_record.get('total_calls', 0)
+                        old_effective = existing_record.get('effective_calls', 0)
+                        old_avg = existing_record.get('average_score')
+                        
+                        logger.info(f"   原有数据: {old_total} 通话, {old_effective} 有效, 平均分 {old_avg}")
+                        logger.info(f"   新增数据: {len(call_details_list)} 通话, {effective_calls} 有效")
+                        
+                        # 合并统计数据
+                        total_calls += old_total
+                        effective_calls += old_effective
+                        
+                        logger.info(f"   合并后: {total_calls} 通话, {effective_calls} 有效")
+                        
+                        # 重新计算平均分
+                        if old_avg and average_score:
+                            old_avg_float = float(old_avg)
+                            old_count = old_total
+                            new_count = len(call_details_list)
+                            if old_count + new_count > 0:
+                                # 计算加权平均分
+                                weighted_avg = (old_avg_float * old_count + average_score * new_count) / (old_count + new_count)
+                                logger.info(f"   原平均分: {old_avg_float:.2f} (基于 {old_count} 个通话)")
+                                logger.info(f"   新平均分: {average_score:.2f} (基于 {new_count} 个通话)")
+                                logger.info(f"   合并后平均分: {weighted_avg:.2f}")
+                                average_score = weighted_avg
+                    else:
+                        logger.info(f"📝 非追加模式或无现有记录:")
+                        logger.info(f"   upload_choice: {current_upload_choice}")
+                        logger.info(f"   existing_record: {'存在' if existing_record else '不存在'}")
                     
-                    # 合并统计数据
-                    total_calls += old_total
-                    effective_calls += old_effective
+                    # 确定是否需要合并分析结果
+                    should_merge_analysis = (current_upload_choice == "append" and existing_record is not None)
+                    logger.info(f"📊 分析结果合并设置: {should_merge_analysis}")
                     
-                    logger.info(f"   合并后: {total_calls} 通话, {effective_calls} 有效")
+                    # 更新日常记录统计信息（音频处理）
+                    if current_upload_choice == "append" and existing_record:
+                        # 追加模式：只传递总计数据，让方法自己处理分类统计的增量
+                        await db.update_daily_record_stats(
+                            daily_record_id,
+                            total_calls,
+                            effective_calls,
+                            average_score,
+                            summary_analysis,
+                            improvement_suggestions,
+                            merge_analysis=should_merge_analysis
+                        )
+                        # 追加模式下单独更新音频统计字段
+                        async with db.acquire() as conn:
+                            await conn.execute(
+                                """
+                                UPDATE daily_call_records 
+                                SET audio_calls = COALESCE(audio_calls, 0) + $2,
+                                    audio_effective_calls = COALESCE(audio_effective_calls, 0) + $3,
+                                    updated_at = CURRENT_TIMESTAMP
+                                WHERE id = $1
+                                """,
+                                daily_record_id, len(call_details_list), effective_calls - old_effective
+                            )
+                            logger.info(f"📊 追加模式：更新音频统计 +{len(call_details_list)} 通话, +{effective_calls - old_effective} 有效")
+                    else:
+                        # 新记录或覆盖模式：直接设置分类统计字段
+                        await db.update_daily_record_stats(
+                            daily_record_id,
+                            total_calls,
+                            effective_calls,
+                            average_score,
+                            summary_analysis,
+                            improvement_suggestions,
+                            merge_analysis=should_merge_analysis,
+                            audio_calls=len(call_details_list),  # 音频通话数等于详情列表长度
+                            audio_effective_calls=effective_calls,  # 音频有效通话数
+                            image_calls=0,  # 音频处理时图片通话为0
+                            image_effective_calls=0  # 音频处理时图片有效通话为0
+                        )
                     
-                    # 重新计算平均分
-                    if old_avg and average_score:
-                        old_avg_float = float(old_avg)
-                        old_count = old_total
-                        new_count = len(call_details_list)
-                        if old_count + new_count > 0:
-                            # 计算加权平均分
-                            weighted_avg = (old_avg_float * old_count + average_score * new_count) / (old_count + new_count)
-                            logger.info(f"   原平均分: {old_avg_float:.2f} (基于 {old_count} 个通话)")
-                            logger.info(f"   新平均分: {average_score:.2f} (基于 {new_count} 个通话)")
-                            logger.info(f"   合并后平均分: {weighted_avg:.2f}")
-                            average_score = weighted_avg
-                else:
-                    logger.info(f"📝 非追加模式或无现有记录:")
-                    logger.info(f"   upload_choice: {current_upload_choice}")
-                    logger.info(f"   existing_record: {'存在' if existing_record else '不存在'}")
-                
-                # 确定是否需要合并分析结果
-                should_merge_analysis = (current_upload_choice == "append" and existing_record is not None)
-                logger.info(f"📊 分析结果合并设置: {should_merge_analysis}")
-                
-                # 更新日常记录统计信息（音频处理）
-                if current_upload_choice == "append" and existing_record:
-                    # 追加模式：只传递总计数据，让方法自己处理分类统计的增量
-                    await db.update_daily_record_stats(
-                        daily_record_id,
-                        total_calls,
-                        effective_calls,
-                        average_score,
-                        summary_analysis,
-                        improvement_suggestions,
-                        merge_analysis=should_merge_analysis
-                    )
-                    # 追加模式下单独更新音频统计字段
+                    # 最终验证：检查保存后的状态
                     async with db.acquire() as conn:
-                        await conn.execute(
-                            """
-                            UPDATE daily_call_records 
-                            SET audio_calls = COALESCE(audio_calls, 0) + $2,
-                                audio_effective_calls = COALESCE(audio_effective_calls, 0) + $3,
-                                updated_at = CURRENT_TIMESTAMP
-                            WHERE id = $1
-                            """,
-                            daily_record_id, len(call_details_list), effective_calls - old_effective
-                        )
-                        logger.info(f"📊 追加模式：更新音频统计 +{len(call_details_list)} 通话, +{effective_calls - old_effective} 有效")
-                else:
-                    # 新记录或覆盖模式：直接设置分类统计字段
-                    await db.update_daily_record_stats(
-                        daily_record_id,
-                        total_calls,
-                        effective_calls,
-                        average_score,
-                        summary_analysis,
-                        improvement_suggestions,
-                        merge_analysis=should_merge_analysis,
-                        audio_calls=len(call_details_list),  # 音频通话数等于详情列表长度
-                        audio_effective_calls=effective_calls,  # 音频有效通话数
-                        image_calls=0,  # 音频处理时图片通话为0
-                        image_effective_calls=0  # 音频处理时图片有效通话为0
-                    )
-                
-                # 最终验证：检查保存后的状态
-                async with db.acquire() as conn:
-                    total_records_final = await conn.fetchval("SELECT COUNT(*) FROM daily_call_records")
-                    total_details_final = await conn.fetchval("SELECT COUNT(*) FROM call_details")
-                    logger.info(f"🎉 最终数据库状态:")
-                    logger.info(f"   每日记录总数: {total_records_final}")
-                    logger.info(f"   通话详情总数: {total_details_final}")
-                
+                        total_records_final = await conn.fetchval("SELECT COUNT(*) FROM daily_call_records")
+                        total_details_final = await conn.fetchval("SELECT COUNT(*) FROM call_details")
+                        logger.info(f"🎉 最终数据库状态:")
+                        logger.info(f"   每日记录总数: {total_records_final}")
+                        logger.info(f"   通话详情总数: {total_details_final}")
+                    
                 logger.info(f"✅ 成功保存分析结果到数据库：{total_calls} 个通话，{effective_calls} 个有效通话")
                 return True
                 
@@ -1159,8 +1258,6 @@ class SyncDatabaseManager:
                 import traceback
                 traceback.print_exc()
                 return False
-            finally:
-                await db.close()
         
         return self._run_async(_save)
     
@@ -1186,9 +1283,7 @@ class SyncDatabaseManager:
         Returns:
             bool: 保存是否成功
         """
-        async def _save():
-            db = DatabaseManager(self.config)
-            await db.initialize()
+        async def _save(db):
             try:
                 today = date.today()
                 
@@ -1210,138 +1305,140 @@ class SyncDatabaseManager:
                     logger.info("📊 没有发现有效的通话记录")
                     return True
                 
-                # 📌 参考录音板块逻辑：处理现有记录
-                existing_record = await db.get_daily_record(salesperson_id, today)
-                
-                # 处理覆盖模式
-                if current_upload_choice == "overwrite" and existing_record:
-                    logger.warning(f"⚠️ 覆盖模式：准备删除销售人员 {salesperson_id} 在 {today} 的现有记录")
-                    logger.warning(f"   即将删除的记录ID: {existing_record['id']}")
+                # 删除、创建记录和插入详情在同一事务中完成，中途出错时整体回滚
+                async with db.transaction():
+                    # 📌 参考录音板块逻辑：处理现有记录
+                    existing_record = await db.get_daily_record(salesperson_id, today)
                     
-                    # 查询将要删除的详情数量
-                    async with db.acquire() as conn:
-                        details_to_delete = await conn.fetchval(
-                            "SELECT COUNT(*) FROM call_details WHERE daily_record_id = $1",
-                            existing_record['id']
-                        )
-                    logger.warning(f"   将删除 {details_to_delete} 条通话详情")
+                    # 处理覆盖模式
+                    if current_upload_choice == "overwrite" and existing_record:
+                        logger.warning(f"⚠️ 覆盖模式：准备删除销售人员 {salesperson_id} 在 {today} 的现有记录")
+                        logger.warning(f"   即将删除的记录ID: {existing_record['id']}")
+                        
+                        # 查询将要删除的详情数量
+                        async with db.acquire() as conn:
+                            details_to_delete = await conn.fetchval(
+                                "SELECT COUNT(*) FROM call_details WHERE daily_record_id = $1",
+                                existing_record['id']
+                            )
+                        logger.warning(f"   将删除 {details_to_delete} 条通话详情")
+                        
+                        # 执行删除操作
+                        await db.delete_daily_record_and_details(existing_record['id'])
+                        existing_record = None  # 重置现有记录状态
                     
-                    # 执行删除操作
-                    await db.delete_daily_record_and_details(existing_record['id'])
-                    existing_record = None  # 重置现有记录状态
-                
-                # 获取或创建日常记录
-                if existing_record and current_upload_choice == "append":
-                    daily_record_id = existing_record['id']
-                    logger.info(f"📝 使用现有记录 (追加模式): ID {daily_record_id}")
-                elif existing_record and current_upload_choice is None:
-                    # 如果存在记录但没有指定操作模式，默认使用追加模式
-                    daily_record_id = existing_record['id']
-                    logger.info(f"📝 使用现有记录 (默认追加模式): ID {daily_record_id}")
-                    current_upload_choice = "append"  # 设置为追加模式
-                else:
-                    # 创建新记录（没有现有记录或覆盖模式删除后）
-                    daily_record_id = await db.create_daily_record(salesperson_id, today)
-                    logger.info(f"📝 创建新记录: ID {daily_record_id}")
-                
-                # 准备统计数据
-                total_calls = len(call_details_list)
-                effective_calls = sum(1 for detail in call_details_list if detail.get('is_effective', False))
-                
-                logger.info(f"📈 图片识别统计信息:")
-                logger.info(f"   总通话数: {total_calls}")
-                logger.info(f"   有效通话数: {effective_calls}")
-                logger.info(f"   图片识别不使用评分字段")
-                
-                # 批量插入通话详情到call_details表
-                if call_details_list:
-                    await db.batch_insert_call_details(
-                        daily_record_id,
-                        salesperson_id,
-                        call_details_list,
-                        record_type='image'  # 标记为图片类型
-                    )
-                    logger.info(f"✅ 成功插入 {len(call_details_list)} 条图片通话详情")
-                
-                # 图片识别不计算平均分
-                average_score = None
-                logger.info(f"📊 图片识别模式：不使用评分字段")
-                
-                # 生成简单的汇总分析
-                summary_analysis = generate_image_summary_analysis(call_details_list, processing_results)
-                improvement_suggestions = None  # 图片识别暂不生成改进建议
-                
-                # 如果是追加模式，需要合并统计数据
-                old_effective = 0  # 初始化变量（用于后续计算增量）
-                if existing_record and current_upload_choice == "append":
-                    logger.info(f"🔄 追加模式：合并统计数据")
+                    # 获取或创建日常记录
+                    if existing_record and current_upload_choice == "append":
+                        daily_record_id = existing_record['id']
+                        logger.info(f"📝 使用现有记录 (追加模式): ID {daily_record_id}")
+                    elif existing_record and current_upload_choice is None:
+                        # 如果存在记录但没有指定操作模式，默认使用追加模式
+                        daily_record_id = existing_record['id']
+                        logger.info(f"📝 使用现有记录 (默认追加模式): ID {daily_record_id}")
+                        current_upload_choice = "append"  # 设置为追加模式
+                    else:
+                        # 创建新记录（没有现有记录或覆盖模式删除后）
+                        daily_record_id = await db.create_daily_record(salesperson_id, today)
+                        logger.info(f"📝 创建新记录: ID {daily_record_id}")
+                    
+                    # 准备统计数据
+                    total_calls = len(call_details_list)
+                    effective_calls = sum(1 for detail in call_details_list if detail.get('is_effective', False))
                     
-                    old_total = existing_record.get('total_calls', 0)
-                    old_effective = existing_record.get('effective_calls', 0)
-                    old_avg = existing_record.get('average_score')
+                    logger.info(f"📈 图片识别统计信息:")
+                    logger.info(f"   总通话数: {total_calls}")
+                    logger.info(f"   有效通话数: {effective_calls}")
+                    logger.info(f"   图片识别不使用评分字段")
                     
-                    logger.info(f"   原有数据: {old_total} 通话, {old_effective} 有效, 平均分 {old_avg}")
-                    logger.info(f"   新增数据: {total_calls} 通话, {effective_calls} 有效")
+                    # 批量插入通话详情到call_details表
+                    if call_details_list:
+                        await db.batch_insert_call_details(
+                            daily_record_id,
+                            salesperson_id,
+                            call_details_list,
+                            record_type='image'  # 标记为图片类型
+                        )
+                        logger.info(f"✅ 成功插入 {len(call_details_list)} 条图片通话详情")
                     
-                    # 合并统计数据
-                    total_calls += old_total
-                    effective_calls += old_effective
+                    # 图片识别不计算平均分
+                    average_score = None
+                    logger.info(f"📊 图片识别模式：不使用评分字段")
                     
-                    logger.info(f"   合并后: {total_calls} 通话, {effective_calls} 有效")
+                    # 生成简单的汇总分析
+                    summary_analysis = generate_image_summary_analysis(call_details_list, processing_results)
+                    improvement_suggestions = None  # 图片识别暂不生成改进建议
                     
-                    # 图片识别不重新计算平均分（保持原有的平均分）
-                    if old_avg:
-                        logger.info(f"   保持原有平均分: {old_avg} (图片识别不影响平均分计算)")
-                        average_score = old_avg
+                    # 如果是追加模式，需要合并统计数据
+                    old_effective = 0  # 初始化变量（用于后续计算增量）
+                    if existing_record and current_upload_choice == "append":
+                        logger.info(f"🔄 追加模式：合并统计数据")
+                        
+                        old_total = existing_record.get('total_calls', 0)
+                        old_effective = existing_record.get('effective_calls', 0)
+                        old_avg = existing_record.get('average_score')
+                        
+                        logger.info(f"   原有数据: {old_total} 通话, {old_effective} 有效, 平均分 {old_avg}")
+                        logger.info(f"   新增数据: {total_calls} 通话, {effective_calls} 有效")
+                        
+                        # 合并统计数据
+                        total_calls += old_total
+                        effective_calls += old_effective
+                        
+                        logger.info(f"   合并后: {total_calls} 通话, {effective_calls} 有效")
+                        
+                        # 图片识别不重新计算平均分（保持原有的平均分）
+                        if old_avg:
+                            logger.info(f"   保持原有平均分: {old_avg} (图片识别不影响平均分计算)")
+                            average_score = old_avg
+                        else:
+                            logger.info(f"   图片识别模式：不计算平均分")
+                            average_score = None
+                    
+                    # 确定是否需要合并分析结果
+                    should_merge_analysis = (current_upload_choice == "append" and existing_record is not None)
+                    logger.info(f"📊 分析结果合并设置: {should_merge_analysis}")
+                    
+                    # 更新日常记录统计信息（图片处理）
+                    if current_upload_choice == "append" and existing_record:
+                        # 追加模式：只传递总计数据，让方法自己处理分类统计的增量
+                        await db.update_daily_record_stats(
+                            daily_record_id,
+                            total_calls,
+                            effective_calls,
+                            average_score,
+                            summary_analysis,
+                            improvement_suggestions,
+                            merge_analysis=should_merge_analysis
+                        )
+                        # 追加模式下单独更新图片统计字段
+                        async with db.acquire() as conn:
+                            await conn.execute(
+                                """
+                                UPDATE daily_call_records 
+                                SET image_calls = COALESCE(image_calls, 0) + $2,
+                                    image_effective_calls = COALESCE(image_effective_calls, 0) + $3,
+                                    updated_at = CURRENT_TIMESTAMP
+                                WHERE id = $1
+                                """,
+                                daily_record_id, len(call_details_list), effective_calls - old_effective
+                            )
+                            logger.info(f"📊 追加模式：更新图片统计 +{len(call_details_list)} 通话, +{effective_calls - old_effective} 有效")
                     else:
-                        logger.info(f"   图片识别模式：不计算平均分")
-                        average_score = None
-                
-                # 确定是否需要合并分析结果
-                should_merge_analysis = (current_upload_choice == "append" and existing_record is not None)
-                logger.info(f"📊 分析结果合并设置: {should_merge_analysis}")
-                
-                # 更新日常记录统计信息（图片处理）
-                if current_upload_choice == "append" and existing_record:
-                    # 追加模式：只传递总计数据，让方法自己处理分类统计的增量
-                    await db.update_daily_record_stats(
-                        daily_record_id,
-                        total_calls,
-                        effective_calls,
-                        average_score,
-                        summary_analysis,
-                        improvement_suggestions,
-                        merge_analysis=should_merge_analysis
-                    )
-                    # 追加模式下单独更新图片统计字段
-                    async with db.acquire() as conn:
-                        await conn.execute(
-                            """
-                            UPDATE daily_call_records 
-                            SET image_calls = COALESCE(image_calls, 0) + $2,
-                                image_effective_calls = COALESCE(image_effective_calls, 0) + $3,
-                                updated_at = CURRENT_TIMESTAMP
-                            WHERE id = $1
-                            """,
-                            daily_record_id, len(call_details_list), effective_calls - old_effective
+                        # 新记录或覆盖模式：直接设置分类统计字段
+                        await db.update_daily_record_stats(
+                            daily_record_id,
+                            total_calls,
+                            effective_calls,
+                            average_score,
+                            summary_analysis,
+                            improvement_suggestions,
+                            merge_analysis=should_merge_analysis,
+                            audio_calls=0,  # 图片处理时音频通话为0
+                            audio_effective_calls=0,  # 图片处理时音频有效通话为0
+                            image_calls=len(call_details_list),  # 图片通话数等于详情列表长度
+                            image_effective_calls=effective_calls  # 图片有效通话数
                         )
-                        logger.info(f"📊 追加模式：更新图片统计 +{len(call_details_list)} 通话, +{effective_calls - old_effective} 有效")
-                else:
-                    # 新记录或覆盖模式：直接设置分类统计字段
-                    await db.update_daily_record_stats(
-                        daily_record_id,
-                        total_calls,
-                        effective_calls,
-                        average_score,
-                        summary_analysis,
-                        improvement_suggestions,
-                        merge_analysis=should_merge_analysis,
-                        audio_calls=0,  # 图片处理时音频通话为0
-                        audio_effective_calls=0,  # 图片处理时音频有效通话为0
-                        image_calls=len(call_details_list),  # 图片通话数等于详情列表长度
-                        image_effective_calls=effective_calls  # 图片有效通话数
-                    )
-                
+                    
                 # 处理错误信息记录
                 errors = processing_results.get("processing_errors", [])
                 if errors:
@@ -1357,8 +1454,6 @@ class SyncDatabaseManager:
                 import traceback
                 traceback.print_exc()
                 return False
-            finally:
-                await db.close()
         
         return self._run_async(_save)
 
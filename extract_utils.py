@@ -7,9 +7,50 @@
 
 import re
 import logging
+from functools import lru_cache
 from typing import Optional, List, Dict, Tuple
 
+logger = logging.getLogger(__name__)
 
+# 预编译的正则表达式（模块加载时编译一次，避免每次调用重复编译和查找re缓存）
+_MD_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+_MD_ITALIC_RE = re.compile(r'\*(.+?)\*')
+
+# 提取内容首尾需要去除的引号（中英文单双引号）
+_QUOTE_CHARS = '"\'\u201c\u201d\u2018\u2019'
+
+# 电话号码中需要去除的空白和连字符（str.translate 在C层完成，比正则替换快）
+# 空白字符与正则的\s一致（包含不间断空格\xa0和\u2000-\u200a等Unicode空格，所有空白字符都不超过\u3000），另加零宽空格\u200b
+_STRIP_TABLE = str.maketrans('', '', ''.join(chr(c) for c in range(0x3001) if chr(c).isspace()) + '\u200b-')
+
+# 电话号码判断：
+# 1. 去除空白和连字符后全是数字且长度在7-15位（手机号、座机等），直接判定
+# 2. 仅带+86等国际前缀的情况才需要走正则
+_PHONE_FALLBACK_RE = re.compile(r'\+86\d{8,15}')
+
+# 总分：兼容 **总分**: XX分 / 100分、总分**: XX分、**总分** XX分、总分：XX分 等写法，
+# 合并为一个正则，只需扫描一次文本
+_TOTAL_SCORE_PATTERN = r'总分(?:\*\*\s*[:：]?|[:：])\s*(?P<score>\d+)分?(?:\s*/\s*100分?)?'
+_TOTAL_SCORE_RE = re.compile(_TOTAL_SCORE_PATTERN)
+
+# 改进建议：兼容 - **改进建议**: [内容]、改进建议**：[内容]、改进建议: [内容] 等写法
+# （多行模式使用内联的(?m)，便于与总分模式合并为一个正则）
+_SUGGESTION_PATTERN = r'改进建议(?:\*\*)?[:：]\s*(?P<suggestion>.+?)(?:\n|$)'
+_SUGGESTION_RE = re.compile(r'(?m)' + _SUGGESTION_PATTERN)
+
+# 总分和改进建议的组合模式，对话分析文本只需扫描一遍即可同时取出两项
+_CONVERSATION_DATA_RE = re.compile(
+    r'(?m)' + _TOTAL_SCORE_PATTERN + '|' + _SUGGESTION_PATTERN
+)
+
+# 改进措施：兼容 - **改进措施**: [内容]、**改进措施**：[内容]
+_MEASURE_RE = re.compile(r'(?m)\*\*改进措施\*\*[:：]\s*(.+?)(?:\n|$)')
+
+# 平均分：兼容 - **平均分**: [数值]、平均分**：[数值]、平均分: [数值]、平均评分: [数值] 等写法
+_AVERAGE_SCORE_RE = re.compile(r'平均评?分(?:\*\*)?[:：]\s*(\d+\.?\d*)')
+
+
+@lru_cache(maxsize=4096)
 def parse_filename_intelligently(filename: str) -> Tuple[str, str, str]:
     """
     智能解析文件名，提取公司名称、联系人、电话号码
@@ -26,25 +67,26 @@ def parse_filename_intelligently(filename: str) -> Tuple[str, str, str]:
     Returns:
         Tuple[str, str, str]: (公司名称, 联系人, 电话号码)
     """
-    # 清理文件名，去除可能的前缀
-    clean_filename = re.sub(r'^temp_', '', filename)
+    # 清理文件名，去除可能的前缀（固定前缀，无需正则）
+    clean_filename = filename.removeprefix('temp_')
     
-    # 按"-"分割
-    parts = clean_filename.split('-')
+    # 按"-"的数量分情况处理，常见格式无需分割出完整列表
+    dash_count = clean_filename.count('-')
     
     company_name = ""
     contact_person = ""
     phone_number = ""
     
-    if len(parts) == 1:
+    if dash_count == 0:
         # 格式: "公司名"
-        company_name = parts[0].strip()
-        
-    elif len(parts) == 2:
+        company_name = clean_filename.strip()
+    
+    elif dash_count == 1:
         # 格式: "公司名-联系人" 或 "公司名-电话号码"
-        part1 = parts[0].strip()
-        part2 = parts[1].strip()
-        
+        part1, _, part2 = clean_filename.partition('-')
+        part1 = part1.strip()
+        part2 = part2.strip()
+
         # 判断第二部分是电话号码还是联系人名
         if _is_phone_number(part2):
             # "公司名-电话号码"
@@ -55,8 +97,9 @@ def parse_filename_intelligently(filename: str) -> Tuple[str, str, str]:
             company_name = part1
             contact_person = part2
             
-    elif len(parts) == 3:
+    elif dash_count == 2:
         # 格式: "公司名-联系人-电话号码"
+        parts = clean_filename.split('-')
         company_name = parts[0].strip()
         contact_person = parts[1].strip()
         potential_phone = parts[2].strip()
@@ -71,34 +114,40 @@ def parse_filename_intelligently(filename: str) -> Tuple[str, str, str]:
             
     else:
         # 格式: 超过3部分，可能是复杂的公司名或其他格式
-        # 尝试从右往左查找电话号码
-        phone_found = False
-        for i in range(len(parts) - 1, -1, -1):
-            if _is_phone_number(parts[i]):
-                phone_number = _clean_phone_number(parts[i])
-                # 电话号码前的部分作为联系人
-                if i > 0:
-                    contact_person = parts[i - 1].strip()
-                # 电话号码和联系人之前的部分作为公司名
-                company_name = "-".join(parts[:max(1, i - 1)]).strip()
-                phone_found = True
-                break
+        # 最常见的是电话号码在末尾，用rpartition直接拆出，无需分割整个文件名
+        head, _, last = clean_filename.rpartition('-')
+        if _is_phone_number(last):
+            phone_number = _clean_phone_number(last)
+            company_name, _, contact_person = head.rpartition('-')
+            company_name = company_name.strip()
+            contact_person = contact_person.strip()
+        else:
+            # 末尾不是电话号码时，再从右往左查找电话号码
+            parts = clean_filename.split('-')
+            phone_found = False
+            for i in range(len(parts) - 2, -1, -1):
+                if _is_phone_number(parts[i]):
+                    phone_number = _clean_phone_number(parts[i])
+                    # 电话号码前的部分作为联系人
+                    if i > 0:
+                        contact_person = parts[i - 1].strip()
+                    # 电话号码和联系人之前的部分作为公司名
+                    company_name = "-".join(parts[:max(1, i - 1)]).strip()
+                    phone_found = True
+                    break
         
-        if not phone_found:
-            # 没有找到电话号码，将最后一部分作为联系人，其余作为公司名
-            if len(parts) > 1:
+            if not phone_found:
+                # 没有找到电话号码，将最后一部分作为联系人，其余作为公司名
                 contact_person = parts[-1].strip()
                 company_name = "-".join(parts[:-1]).strip()
-            else:
-                company_name = clean_filename
-    
+
     # 确保至少有公司名称
     if not company_name and not contact_person and not phone_number:
         company_name = clean_filename
     elif not company_name:
         company_name = "未知公司"
     
-    logging.debug(f"文件名解析结果: 公司='{company_name}', 联系人='{contact_person}', 电话='{phone_number}'")
+    logger.debug("文件名解析结果: 公司='%s', 联系人='%s', 电话='%s'", company_name, contact_person, phone_number)
     return company_name, contact_person, phone_number
 
 
@@ -113,27 +162,14 @@ def _is_phone_number(text: str) -> bool:
         bool: 是否为电话号码
     """
     # 清理空格和连字符
-    clean_text = re.sub(r'[\s-]', '', text)
-    
-    # 电话号码模式：
-    # 1. 11位手机号 (1开头)
-    # 2. 8-15位数字 (包括座机等)
-    # 3. 可能包含+86等国际前缀
-    phone_patterns = [
-        r'^(\+86)?1[3-9]\d{9}$',  # 手机号
-        r'^(\+86)?\d{8,15}$',     # 一般电话号码
-        r'^\d{3,4}-?\d{7,8}$',    # 座机格式
-    ]
-    
-    for pattern in phone_patterns:
-        if re.match(pattern, clean_text):
-            return True
-    
-    # 如果文本全是数字且长度合理，也认为是电话号码
-    if clean_text.isdigit() and 7 <= len(clean_text) <= 15:
+    clean_text = text.translate(_STRIP_TABLE)
+    
+    # 快速路径：全是数字且长度合理
+    if 7 <= len(clean_text) <= 15 and clean_text.isdigit():
         return True
     
-    return False
+    # 回退：带+86前缀的号码
+    return _PHONE_FALLBACK_RE.fullmatch(clean_text) is not None
 
 
 def _clean_phone_number(phone: str) -> str:
@@ -147,7 +183,7 @@ def _clean_phone_number(phone: str) -> str:
         str: 清理后的电话号码
     """
     # 去除空格、连字符等
-    clean_phone = re.sub(r'[\s-]', '', phone)
+    clean_phone = phone.translate(_STRIP_TABLE)
     return clean_phone
 
 
@@ -164,24 +200,13 @@ def extract_total_score(analysis_text: str) -> Optional[str]:
         str: 提取到的总分，如果未找到则返回None
     """
     # 精确匹配结构化输出格式
-    patterns = [
-        r'\*\*总分\*\*:\s*(\d+)分?\s*/\s*100分?',  # **总分**: XX分 / 100分
-        r'\*\*总分\*\*:\s*(\d+)分?',  # **总分**: XX分
-        r'总分\*\*:\s*(\d+)分?\s*/\s*100分?',  # 总分**: XX分 / 100分
-        r'总分\*\*:\s*(\d+)分?',  # 总分**: XX分
-        r'\*\*总分\*\*\s*(\d+)分?',  # **总分** XX分
-        r'总分[:：]\s*(\d+)分?\s*/\s*100分?',  # 总分: XX分 / 100分
-        r'总分[:：]\s*(\d+)分?'  # 总分: XX分
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, analysis_text)
-        if match:
-            score = match.group(1)
-            logging.debug(f"提取到总分: {score}")
-            return score
+    match = _TOTAL_SCORE_RE.search(analysis_text)
+    if match:
+        score = match.group('score')
+        logger.debug("提取到总分: %s", score)
+        return score
     
-    logging.warning("未能从分析结果中提取到总分")
+    logger.warning("未能从分析结果中提取到总分")
     return None
 
 
@@ -198,31 +223,48 @@ def extract_improvement_suggestion(analysis_text: str) -> Optional[str]:
         str: 提取到的改进建议，如果未找到则返回None
     """
     # 精确匹配结构化输出格式
-    patterns = [
-        r'-\s*\*\*改进建议\*\*:\s*(.+?)(?:\n|$)',  # - **改进建议**: [内容]
-        r'-\s*\*\*改进建议\*\*[:：]\s*(.+?)(?:\n|$)',  # - **改进建议**：[内容]
-        r'\*\*改进建议\*\*:\s*(.+?)(?:\n|$)',  # **改进建议**: [内容]
-        r'\*\*改进建议\*\*[:：]\s*(.+?)(?:\n|$)',  # **改进建议**：[内容]
-        r'改进建议\*\*:\s*(.+?)(?:\n|$)',  # 改进建议**: [内容]
-        r'改进建议\*\*[:：]\s*(.+?)(?:\n|$)',  # 改进建议**：[内容]
-        r'改进建议[:：]\s*(.+?)(?:\n|$)'  # 改进建议: [内容]
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, analysis_text, re.MULTILINE)
-        if match:
-            suggestion = match.group(1).strip()
-            # 清理Markdown格式
-            suggestion = re.sub(r'\*\*(.+?)\*\*', r'\1', suggestion)
-            suggestion = re.sub(r'\*(.+?)\*', r'\1', suggestion)
-            suggestion = suggestion.strip('""''')
-            logging.debug(f"提取到改进建议: {suggestion}")
-            return suggestion
-    
-    logging.warning("未能从分析结果中提取到改进建议")
+    match = _SUGGESTION_RE.search(analysis_text)
+    if match:
+        suggestion = _clean_suggestion(match.group('suggestion'))
+        logger.debug("提取到改进建议: %s", suggestion)
+        return suggestion
+    
+    logger.warning("未能从分析结果中提取到改进建议")
     return None
 
 
+def _strip_markdown(text: str) -> str:
+    """
+    去除文本中的Markdown粗体和斜体标记
+    
+    Args:
+        text: 原始文本
+    
+    Returns:
+        str: 去除标记后的文本
+    """
+    # 大多数文本不含星号，直接返回，无需进入正则引擎
+    if '*' not in text:
+        return text
+    # 先去粗体再去斜体，顺序不能调换（否则"***文本***"、"2*3"等会被错误替换）
+    text = _MD_BOLD_RE.sub(r'\1', text)
+    return _MD_ITALIC_RE.sub(r'\1', text)
+
+
+def _clean_suggestion(suggestion: str) -> str:
+    """
+    清理提取到的改进建议文本中的Markdown格式和首尾引号
+    
+    Args:
+        suggestion: 原始改进建议文本
+    
+    Returns:
+        str: 清理后的改进建议
+    """
+    # 清理Markdown格式
+    return _strip_markdown(suggestion.strip()).strip(_QUOTE_CHARS)
+
+
 def extract_summary_measures(summary_text: str) -> List[str]:
     """
     从汇总分析结果中提取改进措施
@@ -235,28 +277,16 @@ def extract_summary_measures(summary_text: str) -> List[str]:
     Returns:
         List[str]: 提取到的改进措施列表
     """
-    measures = []
+    # 精确匹配结构化输出格式，一次findall取出全部匹配
+    cleaned = []
+    for measure in _MEASURE_RE.findall(summary_text):
+        # 清理Markdown格式
+        cleaned.append(_strip_markdown(measure.strip()).strip(_QUOTE_CHARS))
     
-    # 精确匹配结构化输出格式
-    patterns = [
-        r'-\s*\*\*改进措施\*\*:\s*(.+?)(?:\n|$)',  # - **改进措施**: [内容]
-        r'-\s*\*\*改进措施\*\*[:：]\s*(.+?)(?:\n|$)',  # - **改进措施**：[内容]
-        r'\*\*改进措施\*\*:\s*(.+?)(?:\n|$)',  # **改进措施**: [内容]
-        r'\*\*改进措施\*\*[:：]\s*(.+?)(?:\n|$)',  # **改进措施**：[内容]
-    ]
-    
-    for pattern in patterns:
-        matches = re.finditer(pattern, summary_text, re.MULTILINE)
-        for match in matches:
-            measure = match.group(1).strip()
-            # 清理Markdown格式
-            measure = re.sub(r'\*\*(.+?)\*\*', r'\1', measure)
-            measure = re.sub(r'\*(.+?)\*', r'\1', measure)
-            measure = measure.strip('""''')
-            if measure and measure not in measures:
-                measures.append(measure)
-    
-    logging.debug(f"提取到{len(measures)}个改进措施")
+    # dict.fromkeys 在保持原有顺序的同时以O(n)完成去重
+    measures = [measure for measure in dict.fromkeys(cleaned) if measure]
+    
+    logger.debug("提取到%d个改进措施", len(measures))
     return measures
 
 
@@ -273,25 +303,13 @@ def extract_average_score(summary_text: str) -> Optional[str]:
         str: 提取到的平均分，如果未找到则返回None
     """
     # 精确匹配结构化输出格式
-    patterns = [
-        r'-\s*\*\*平均分\*\*:\s*(\d+\.?\d*)',  # - **平均分**: [数值]
-        r'-\s*\*\*平均分\*\*[:：]\s*(\d+\.?\d*)',  # - **平均分**：[数值]
-        r'\*\*平均分\*\*:\s*(\d+\.?\d*)',  # **平均分**: [数值]
-        r'\*\*平均分\*\*[:：]\s*(\d+\.?\d*)',  # **平均分**：[数值]
-        r'平均分\*\*:\s*(\d+\.?\d*)',  # 平均分**: [数值]
-        r'平均分\*\*[:：]\s*(\d+\.?\d*)',  # 平均分**：[数值]
-        r'平均分[:：]\s*(\d+\.?\d*)',  # 平均分: [数值]
-        r'平均评分[:：]\s*(\d+\.?\d*)'  # 平均评分: [数值]
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, summary_text)
-        if match:
-            score = match.group(1)
-            logging.debug(f"提取到平均分: {score}")
-            return score
+    match = _AVERAGE_SCORE_RE.search(summary_text)
+    if match:
+        score = match.group(1)
+        logger.debug("提取到平均分: %s", score)
+        return score
     
-    logging.warning("未能从汇总分析中提取到平均分")
+    logger.warning("未能从汇总分析中提取到平均分")
     return None
 
 
@@ -305,9 +323,37 @@ def extract_all_conversation_data(analysis_text: str) -> Dict[str, Optional[str]
     Returns:
         Dict[str, Optional[str]]: 包含总分和改进建议的字典
     """
+    score = None
+    suggestion = None
+    
+    # 一次扫描同时查找总分和改进建议，两项都找到后立即停止
+    for match in _CONVERSATION_DATA_RE.finditer(analysis_text):
+        if match.group('score') is not None:
+            if score is None:
+                score = match.group('score')
+        elif suggestion is None:
+            suggestion = _clean_suggestion(match.group('suggestion'))
+        if score is not None and suggestion is not None:
+            break
+    
+    # 总分可能恰好出现在改进建议的同一行而被其匹配覆盖，此时再单独查找一次
+    if score is None and suggestion is not None:
+        match = _TOTAL_SCORE_RE.search(analysis_text)
+        if match:
+            score = match.group('score')
+    
+    if score is not None:
+        logger.debug("提取到总分: %s", score)
+    else:
+        logger.warning("未能从分析结果中提取到总分")
+    if suggestion is not None:
+        logger.debug("提取到改进建议: %s", suggestion)
+    else:
+        logger.warning("未能从分析结果中提取到改进建议")
+    
     return {
-        "score": extract_total_score(analysis_text),
-        "suggestion": extract_improvement_suggestion(analysis_text)
+        "score": score,
+        "suggestion": suggestion
     }
 
 
@@ -5,6 +5,10 @@
 
 import streamlit as st
 import base64
+import os
+import threading
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 from io import BytesIO
 import logging
@@ -12,8 +16,21 @@ from typing import List, Tuple, Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# 图片优化线程池（首次使用时创建）；Pillow在解码/编码时会释放GIL，多线程可并行利用多核
+_image_executor: Optional[ThreadPoolExecutor] = None
+_image_executor_lock = threading.Lock()
+
+def _get_image_executor() -> ThreadPoolExecutor:
+    """获取图片优化线程池，首次调用时创建（多个会话同时首次调用时只会创建一个）"""
+    global _image_executor
+    with _image_executor_lock:
+        if _image_executor is None:
+            _image_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4,
+                                                 thread_name_prefix="image_optimize")
+        return _image_executor
+
 def optimize_image_for_llm(image_content: bytes, max_size: Tuple[int, int] = (1024, 1024), 
-                          quality: int = 85) -> bytes:
+                          quality: int = 85, image: Optional[Image.Image] = None) -> bytes:
     """
     优化图片大小和格式，提高LLM识别效果
     
@@ -21,13 +38,21 @@ def optimize_image_for_llm(image_content: bytes, max_size: Tuple[int, int] = (10
         image_content: 原始图片字节数据
         max_size: 最大尺寸 (width, height)
         quality: JPEG质量 (1-100)
+        image: validate_image_format已打开（尚未解码像素）的图片对象，传入时不再重新打开
     
     Returns:
         优化后的图片字节数据
     """
     try:
-        # 打开图片
-        image = Image.open(BytesIO(image_content))
+        # 打开图片（复用校验阶段已打开的图片对象）
+        if image is None:
+            image = Image.open(BytesIO(image_content))
+        
+        # JPEG图片在解码阶段由libjpeg按1/2、1/4、1/8直接缩放（非JPEG时为空操作），
+        # 避免为了缩小而先解码全分辨率像素
+        decoded_size = image.size
+        image.draft('RGB', max_size)
+        drafted = image.size != decoded_size
         
         # 转换为RGB模式（如果是RGBA或其他模式）
         if image.mode != 'RGB':
@@ -39,7 +64,9 @@ def optimize_image_for_llm(image_content: bytes, max_size: Tuple[int, int] = (10
         
         if ratio < 1:  # 只有当图片比最大尺寸大时才压缩
             new_size = (int(original_size[0] * ratio), int(original_size[1] * ratio))
-            image = image.resize(new_size, Image.Resampling.LANCZOS)
+            # draft已完成大部分缩放时，剩余的小幅缩放用BILINEAR即可
+            resample = Image.Resampling.BILINEAR if drafted else Image.Resampling.LANCZOS
+            image = image.resize(new_size, resample)
         
         # 保存为JPEG格式
         output = BytesIO()
@@ -53,6 +80,31 @@ def optimize_image_for_llm(image_content: bytes, max_size: Tuple[int, int] = (10
         logger.error(f"图片优化失败: {str(e)}")
         return image_content  # 如果优化失败，返回原始内容
 
+def optimize_images_batch(contents: List[bytes],
+                          images: Optional[List[Optional[Image.Image]]] = None) -> List[bytes]:
+    """
+    使用线程池并行优化多张图片
+    
+    Args:
+        contents: 原始图片字节数据列表
+        images: 与contents一一对应的已打开图片对象列表（可选）
+    
+    Returns:
+        优化后的图片字节数据列表，顺序与输入一致
+    """
+    if not contents:
+        return []
+    if images is None:
+        images = [None] * len(contents)
+    
+    # 单张图片无需经过线程池
+    if len(contents) == 1:
+        return [optimize_image_for_llm(contents[0], image=images[0])]
+    
+    executor = _get_image_executor()
+    return list(executor.map(lambda args: optimize_image_for_llm(args[0], image=args[1]),
+                             zip(contents, images)))
+
 def encode_image_to_base64(image_content: bytes) -> str:
     """
     将图片内容编码为base64字符串
@@ -65,6 +117,10 @@ def encode_image_to_base64(image_content: bytes) -> str:
     """
     return base64.b64encode(image_content).decode('utf-8')
 
+# 超过该数量的图片预览改为批量渲染
+PREVIEW_BATCH_THRESHOLD = 10
+PREVIEW_IMAGE_WIDTH = 200
+
 def create_image_preview_grid(uploaded_images: List[Any], columns: int = 3) -> None:
     """
     创建图片预览网格布局
@@ -78,6 +134,16 @@ def create_image_preview_grid(uploaded_images: List[Any], columns: int = 3) -> N
     
     st.markdown("### 📸 图片预览")
     
+    # 图片较多时一次性传入列表渲染，只产生一条前端消息，而不是每张图片各自创建列和组件
+    if len(uploaded_images) > PREVIEW_BATCH_THRESHOLD:
+        try:
+            captions = [f"{img_file.name}（{format_file_size(img_file.size)}）"
+                        for img_file in uploaded_images]
+            st.image(list(uploaded_images), caption=captions, width=PREVIEW_IMAGE_WIDTH)
+        except Exception as e:
+            st.error(f"无法预览图片: {str(e)}")
+        return
+    
     # 创建网格布局
     for i in range(0, len(uploaded_images), columns):
         cols = st.columns(columns)
@@ -96,6 +162,8 @@ def create_image_preview_grid(uploaded_images: List[Any], columns: int = 3) -> N
                 except Exception as e:
                     st.error(f"无法预览图片 {img_file.name}: {str(e)}")
 
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB')
+
 def format_file_size(size_bytes: int) -> str:
     """
     格式化文件大小显示
@@ -108,45 +176,48 @@ def format_file_size(size_bytes: int) -> str:
     """
     if size_bytes < 1024:
         return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    else:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
+    
+    # 每1024倍对应二进制位数增加10位，直接由bit_length算出单位下标
+    unit_index = min(len(_SIZE_UNITS) - 1, (size_bytes.bit_length() - 1) // 10)
+    return f"{size_bytes / (1 << (10 * unit_index)):.1f} {_SIZE_UNITS[unit_index]}"
 
-def validate_image_format(image_file: Any) -> Tuple[bool, str]:
+def validate_image_format(image_file: Any) -> Tuple[bool, str, Optional[Image.Image]]:
     """
     验证图片格式是否支持
     
+    Image.open 只解析文件头，不解码像素，打开的图片对象会一并返回，
+    供 optimize_image_for_llm 复用，避免同一张图片被打开两次
+    
     Args:
         image_file: Streamlit上传的图片文件
     
     Returns:
-        (是否有效, 错误信息)
+        (是否有效, 错误信息, 已打开的图片对象或None)
     """
     try:
         # 检查文件扩展名
         valid_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.gif']
         file_extension = image_file.name.lower().split('.')[-1]
         if f".{file_extension}" not in valid_extensions:
-            return False, f"不支持的文件格式: {file_extension}"
+            return False, f"不支持的文件格式: {file_extension}", None
         
-        # 尝试打开图片验证格式
+        # 检查文件大小（无需打开图片，先行判断）
         image_content = image_file.getvalue()
+        if len(image_content) > 10 * 1024 * 1024:  # 10MB
+            return False, "图片文件过大，请压缩后重新上传", None
+        
+        # 尝试打开图片验证格式（仅读取文件头）
         image = Image.open(BytesIO(image_content))
         
         # 检查图片尺寸
         width, height = image.size
         if width < 100 or height < 100:
-            return False, "图片尺寸过小，可能影响识别效果"
-        
-        # 检查文件大小
-        if len(image_content) > 10 * 1024 * 1024:  # 10MB
-            return False, "图片文件过大，请压缩后重新上传"
+            return False, "图片尺寸过小，可能影响识别效果", None
         
-        return True, ""
+        return True, "", image
         
     except Exception as e:
-        return False, f"图片格式验证失败: {str(e)}"
+        return False, f"图片格式验证失败: {str(e)}", None
 
 def handle_image_processing_errors(errors: List[Dict[str, Any]]) -> None:
     """
@@ -235,17 +306,13 @@ def display_duplicate_analysis(duplicate_result: Dict[str, Any]) -> Optional[str
     with st.expander("📋 查看重复文件详情", expanded=True):
         duplicates = duplicate_result.get("duplicates", [])
         
-        for i, dup in enumerate(duplicates, 1):
-            col1, col2, col3 = st.columns([2, 1, 1])
-            
-            with col1:
-                st.write(f"**{i}. {dup['filename']}**")
-            
-            with col2:
-                st.write(f"上次上传: {dup['last_upload_date']}")
-            
-            with col3:
-                st.write(f"{dup['days_ago']} 天前")
+        # 用一个表格展示全部重复文件，避免每行创建一组列组件
+        df = pd.DataFrame({
+            "文件名": [dup['filename'] for dup in duplicates],
+            "上次上传": [dup['last_upload_date'] for dup in duplicates],
+            "距今天数": [f"{dup['days_ago']} 天前" for dup in duplicates]
+        }, index=range(1, len(duplicates) + 1))
+        st.dataframe(df, use_container_width=True)
     
     # 显示统计信息
     col1, col2, col3 = st.columns(3)
@@ -313,7 +380,6 @@ def display_duplicate_files_info(duplicate_result: Dict[str, Any]) -> None:
         })
     
     if data:
-        import pandas as pd
         df = pd.DataFrame(data)
         st.dataframe(df, use_container_width=True, hide_index=True)
         
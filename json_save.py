@@ -4,32 +4,33 @@ import os
 import requests
 import urllib.parse
 
+# 优先使用orjson解析讯飞返回的大段JSON，未安装时回退到标准库json
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
 
 def read_jsonfile(path, en='utf-8'):
     with open(path, "r", encoding=en) as f:
-        return json.load(f)
+        return _loads(f.read())
 
 
 def merge_result_for_one_vad(result_vad):
-    content = []
-    for rt_dic in result_vad['st']['rt']:
-        spk_str = 'spk' + str(3 - int(result_vad['st']['rl'])) + '##'
-        for st_dic in rt_dic['ws']:
-            for cw_dic in st_dic['cw']:
-                for w in cw_dic['w']:
-                    spk_str += w
-
-        spk_str += '\n'
-        print(spk_str)
-
-    return spk_str
+    spk_str = 'spk' + str(3 - int(result_vad['st']['rl'])) + '##'
+    # 一次join拼接该VAD内所有词，避免逐字符串相加
+    words = ''.join(
+        cw_dic['w']
+        for rt_dic in result_vad['st']['rt']
+        for st_dic in rt_dic['ws']
+        for cw_dic in st_dic['cw']
+    )
+    return spk_str + words + '\n'
 
 
 def content_to_file(content, output_file_path):
     with open(output_file_path, 'w', encoding='utf-8') as f:
-        for lines in content:
-            f.write(lines)
-        f.close()
+        f.write(''.join(content))
 
 
 class XunfeiASR:
@@ -41,7 +42,9 @@ class XunfeiASR:
 
     def process_audio(self):
         # 上传文件
-        file_len = os.path.getsize(self.file_path)
+        # 只stat一次文件，复用其中的文件大小
+        file_stat = os.stat(self.file_path)
+        file_len = file_stat.st_size
         file_name = os.path.basename(self.file_path)
 
         param_dict = {
@@ -55,15 +58,17 @@ class XunfeiASR:
             'roleType': 1
         }
 
-        # 修改这部分：直接读取二进制数据
-        data = open(self.file_path, 'rb').read(file_len)
-
         upload_url = XFASR_HOST + '/upload'
-        response = requests.post(
-            url=upload_url + "?" + urllib.parse.urlencode(param_dict),
-            headers={"Content-type": "application/x-www-form-urlencoded"},  # 修改请求头
-            data=data
-        )
+        # 直接把文件对象交给requests流式上传，避免整个音频读入内存，并确保文件句柄被关闭
+        with open(self.file_path, 'rb') as audio_file:
+            response = requests.post(
+                url=upload_url + "?" + urllib.parse.urlencode(param_dict),
+                headers={
+                    "Content-type": "application/x-www-form-urlencoded",  # 修改请求头
+                    "Content-Length": str(file_len)
+                },
+                data=audio_file
+            )
         
         result = json.loads(response.text)
         if result.get('code') != 0:
@@ -74,12 +79,12 @@ if __name__ == '__main__':
 
     path_xunfei = "xxxxxxx.json"
     output_path_xunfei = "xunfei_output.txt"
-    js_xunfei = read_jsonfile(path_xunfei)
-    js_xunfei_result = json.loads(js_xunfei['content']['orderResult'])
+    # orderResult本身是JSON字符串，需要整体解析一次；外层JSON解析后即可丢弃
+    js_xunfei_result = _loads(read_jsonfile(path_xunfei)['content']['orderResult'])
     # lattice是做了顺滑功能的识别结果，lattice2是不做顺滑功能的识别结果
-    # json_1best：单个VAD的json结果
-    content = []
-    for result_one_vad_str in js_xunfei_result['lattice']:
-        js_result_one_vad = json.loads(result_one_vad_str['json_1best'])
-        content.append(merge_result_for_one_vad(js_result_one_vad))
+    # json_1best：单个VAD的json结果，用生成器逐个解析，内存中只保留当前VAD的解析结果
+    content = (
+        merge_result_for_one_vad(_loads(result_one_vad_str['json_1best']))
+        for result_one_vad_str in js_xunfei_result['lattice']
+    )
     content_to_file(content, output_path_xunfei)
\ No newline at end of file
@@ -3,26 +3,18 @@ import os
 import asyncio
 import logging
 import concurrent.futures
+import tempfile
 from io import BytesIO
-import re
 import openpyxl
-from datetime import date, datetime
-import pytz
-from config import LOGGING_CONFIG, EXCEL_CONFIG, DATABASE_CONFIG, get_current_db_config
+from datetime import date
+from config import LOGGING_CONFIG, EXCEL_CONFIG, SUMMARY_ANALYSIS_CONFIG, get_current_db_config
 from database_utils import SyncDatabaseManager
-from Audio_Recognition import (
-    process_file,
-    process_all_files
-)
-from Identify_Roles import (
-    identify_roles,
-    format_conversation_with_roles
-)
-from Analyze_Conversation import analyze_conversation_with_roles
+from Audio_Recognition import process_all_files
 from Analyze_Summary import analyze_summary
-from LLM_Workflow import llm_workflow
 from extract_utils import extract_all_conversation_data, extract_all_summary_data, parse_filename_intelligently
 import json
+import hashlib
+import time
 
 # 配置日志输出
 logging.basicConfig(
@@ -31,12 +23,39 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 完整分析报告中各段落之间的分隔线
+REPORT_SEPARATOR = "=" * 50
+
+# Excel总结行单元格的对齐方式：顶部对齐 + 自动换行（只创建一次，各单元格共用）
+SUMMARY_CELL_ALIGNMENT = openpyxl.styles.Alignment(
+    wrapText=True,
+    vertical='top',
+    horizontal='left'
+)
+
+async def _run_and_cancel_leftovers(coro):
+    """
+    运行协程，结束时取消并等待仍未完成的其他任务
+
+    Streamlit中止运行时会在下一次调用st.*时抛出异常（例如process_all_files中更新进度条时），
+    此时as_completed创建的子任务仍处于挂起状态；这里统一取消，避免它们在临时文件已删除后继续上传和调用LLM
+    """
+    try:
+        return await coro
+    finally:
+        current = asyncio.current_task()
+        pending = [task for task in asyncio.all_tasks() if task is not current and not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
 def run_async_process(coro):
-    """专门用于运行process_all_files的异步包装器"""
+    """专门用于运行process_all_files等协程的异步包装器（每次调用使用新的事件循环，结束后关闭）"""
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     try:
-        return loop.run_until_complete(coro)
+        return loop.run_until_complete(_run_and_cancel_leftovers(coro))
     finally:
         loop.close()
 
@@ -110,10 +129,18 @@ with button_col:
 # 初始化session state
 if 'analysis_results' not in st.session_state:
     st.session_state.analysis_results = None
-if 'combined_report' not in st.session_state:
-    st.session_state.combined_report = None
+if 'report_parts' not in st.session_state:
+    st.session_state.report_parts = None  # 完整报告的各个片段，下载时才拼接
 if 'summary_analysis' not in st.session_state:
     st.session_state.summary_analysis = None
+if 'rendered_conversations' not in st.session_state:
+    st.session_state.rendered_conversations = None  # 对话记录页的预渲染Markdown
+if 'excel_report' not in st.session_state:
+    st.session_state.excel_report = None  # 已生成的Excel报告 (字节数据, 文件名)
+if 'call_fields' not in st.session_state:
+    st.session_state.call_fields = None  # 每个文件解析出的客户信息和评分，与analysis_results一一对应
+if 'conversion_summary' not in st.session_state:
+    st.session_state.conversion_summary = None  # 文件转换状态统计（summarize_conversions的结果）
 if 'analysis_completed' not in st.session_state:
     st.session_state.analysis_completed = False  # 用来标记分析是否完成
 if 'tutorial_shown' not in st.session_state:
@@ -129,10 +156,499 @@ if 'upload_choice' not in st.session_state:
 
 # 初始化数据库管理器
 def get_db_manager():
-    """获取数据库管理器实例（不使用缓存以避免连接问题）"""
-    # 移除缓存装饰器，每次都创建新实例，避免连接断开问题
+    """
+    获取数据库管理器实例
+
+    实例本身只保存配置，创建开销很小；连接池由database_utils在后台事件循环中按数据库共享复用，
+    连接失效时由SyncDatabaseManager自动丢弃并重建
+    """
     return SyncDatabaseManager(get_current_db_config())
 
+@st.cache_data(ttl=300, show_spinner=False)
+def load_salespersons() -> list:
+    """
+    获取销售人员列表（缓存5分钟，页面重新运行时不再每次查询数据库）
+
+    Returns:
+        list: 销售人员字典列表，包含id和name等字段
+    """
+    # asyncpg.Record无法被缓存序列化，转换为普通字典
+    return [dict(sp) for sp in get_db_manager().get_salespersons()]
+
+@st.cache_data(ttl=60, show_spinner=False)
+def has_daily_record(salesperson_id: int, iso_date: str) -> bool:
+    """
+    检查销售人员在指定日期是否已有上传记录（缓存1分钟，选择覆盖/追加期间的重新运行不再重复查询）
+
+    保存分析结果后需调用has_daily_record.clear()，使下一次运行读取到最新状态
+
+    Args:
+        salesperson_id: 销售人员ID
+        iso_date: 日期（YYYY-MM-DD）
+
+    Returns:
+        bool: 是否已有记录
+    """
+    return get_db_manager().check_daily_record_exists(salesperson_id, date.fromisoformat(iso_date))
+
+@st.cache_data(ttl=60, show_spinner=False)
+def find_duplicate_uploads(salesperson_id: int, filenames: tuple) -> dict:
+    """
+    检测最近30天内已上传过的同名文件（缓存1分钟，与has_daily_record一样在保存后清除）
+
+    Args:
+        salesperson_id: 销售人员ID
+        filenames: 本次上传的文件名
+
+    Returns:
+        dict: check_duplicate_filenames的检测结果（duplicates和new_files）
+    """
+    return get_db_manager().check_duplicate_filenames(
+        salesperson_id,
+        list(filenames),
+        days_back=30  # 检测最近30天
+    )
+
+def _save_uploaded_file(uploaded_file, temp_dir: str) -> str:
+    """将单个上传文件写入临时文件夹，返回临时文件路径"""
+    temp_path = os.path.join(temp_dir, f"temp_{uploaded_file.name}")
+    with open(temp_path, "wb") as f:
+        f.write(uploaded_file.getbuffer())
+    return temp_path
+
+def save_uploaded_files(uploaded_files, temp_dir: str = "temp") -> list:
+    """
+    使用线程池并行保存上传文件到临时文件夹
+
+    Args:
+        uploaded_files: Streamlit上传的文件列表
+        temp_dir: 临时文件夹路径
+
+    Returns:
+        list: 临时文件路径列表，顺序与上传顺序一致
+    """
+    # 确保临时文件夹存在
+    os.makedirs(temp_dir, exist_ok=True)
+    max_workers = min(8, len(uploaded_files)) or 1
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda f: _save_uploaded_file(f, temp_dir), uploaded_files))
+
+def render_conversations(analysis_results: list, call_fields: list) -> list:
+    """
+    预先将每条对话记录的角色说明和对话内容渲染为一段Markdown
+
+    Args:
+        analysis_results: process_all_files返回的分析结果列表
+        call_fields: derive_call_fields的返回结果，其中为None的记录即分析失败
+
+    Returns:
+        list: 与analysis_results一一对应的Markdown文本，分析失败的记录为None
+    """
+    rendered = []
+    for res, fields in zip(analysis_results, call_fields):
+        if fields is None:
+            rendered.append(None)
+            continue
+        analysis_result = res["analysis_result"]
+        roles = analysis_result["roles"]
+        rendered.append(
+            f"**角色说明：**\n\n"
+            f"- 说话者1 ({roles['spk1']})\n"
+            f"- 说话者2 ({roles['spk2']})\n\n"
+            f"**详细对话：**\n\n"
+            f"{analysis_result['formatted_text']}\n\n"
+            f"---"
+        )
+    return rendered
+
+def _prune_summary_cache(cache_dir: str):
+    """
+    清理汇总分析磁盘缓存：删除超过有效期的文件，并在数量超过上限时删除最早写入的文件
+
+    Args:
+        cache_dir: 缓存目录
+    """
+    ttl_seconds = SUMMARY_ANALYSIS_CONFIG["cache_ttl_days"] * 86400
+    max_entries = SUMMARY_ANALYSIS_CONFIG["cache_max_entries"]
+    now = time.time()
+
+    entries = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".md") or not entry.is_file():
+                    continue
+                try:
+                    mtime = entry.stat().st_mtime
+                except OSError:
+                    continue
+                if now - mtime > ttl_seconds:
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+                else:
+                    entries.append((mtime, entry.path))
+    except OSError as e:
+        logger.warning(f"清理汇总分析缓存失败: {e}")
+        return
+
+    if len(entries) > max_entries:
+        entries.sort()
+        for _, path in entries[:len(entries) - max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def cached_analyze_summary(successful_results: list) -> str:
+    """
+    生成汇总分析，相同的分析内容直接复用磁盘上缓存的结果，避免重复调用LLM
+
+    缓存键为汇总分析实际用到的字段（通话有效性、分析状态和分析文本）、模型配置和提示词版本的SHA-256，
+    因此重新处理相同的文件或页面刷新后再次分析都能命中缓存；更换模型、温度或提升提示词版本后旧缓存自动失效。
+    分析出错的结果不会被缓存，缓存文件超过有效期或数量上限时会被清理
+
+    Args:
+        successful_results: 转写成功的分析结果列表
+
+    Returns:
+        str: 汇总分析报告
+    """
+    key_source = json.dumps({
+        "model_name": SUMMARY_ANALYSIS_CONFIG["model_name"],
+        "temperature": SUMMARY_ANALYSIS_CONFIG["temperature"],
+        "prompt_version": SUMMARY_ANALYSIS_CONFIG["prompt_version"],
+        "results": [
+            {
+                "is_valid_call": res.get("is_valid_call", True),
+                "status": res.get("status"),
+                "analysis_status": (res.get("analysis_result") or {}).get("status"),
+                "analysis": (res.get("analysis_result") or {}).get("analysis")
+            }
+            for res in successful_results
+        ]
+    }, ensure_ascii=False, sort_keys=True)
+    cache_key = hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+    cache_dir = SUMMARY_ANALYSIS_CONFIG["cache_dir"]
+    cache_path = os.path.join(cache_dir, f"{cache_key}.md")
+
+    try:
+        # 超过有效期的缓存视为未命中
+        if time.time() - os.path.getmtime(cache_path) <= SUMMARY_ANALYSIS_CONFIG["cache_ttl_days"] * 86400:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                summary = f.read()
+            logger.info(f"汇总分析命中缓存: {cache_key}")
+            return summary
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"读取汇总分析缓存失败: {e}")
+
+    summary = analyze_summary(successful_results)
+
+    if not summary.startswith("汇总分析过程中出现错误"):
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # 先写临时文件再替换，避免并发会话读到写了一半的缓存；
+            # 各会话是同一进程中的线程，临时文件名由mkstemp生成，保证互不相同
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(summary)
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            logger.warning(f"写入汇总分析缓存失败: {e}")
+        else:
+            _prune_summary_cache(cache_dir)
+
+    return summary
+
+def derive_call_fields(analysis_results: list) -> list:
+    """
+    为每个分析成功的文件解析一次文件名并提取评分和改进建议，
+    数据库保存、结果展示和Excel报告共用这份结果，不再各自重复解析
+
+    Args:
+        analysis_results: process_all_files返回的分析结果列表
+
+    Returns:
+        list: 与analysis_results一一对应的字典，分析失败的记录为None。字典包含：
+            file_name: 去除临时前缀后的文件名
+            display_name: 去除扩展名的文件名
+            company_name / contact_person / phone_number: 文件名解析结果
+            extracted_data: extract_all_conversation_data的提取结果
+    """
+    call_fields = []
+    for res in analysis_results:
+        analysis_result = res.get("analysis_result") or {}
+        if res["status"] != "success" or analysis_result.get("status") != "success":
+            call_fields.append(None)
+            continue
+        file_name = os.path.basename(res["file_path"]).removeprefix('temp_')
+        display_name = os.path.splitext(file_name)[0]
+
+        # 使用智能文件名解析
+        company_name, contact_person, phone_number = parse_filename_intelligently(display_name)
+
+        call_fields.append({
+            "file_name": file_name,
+            "display_name": display_name,
+            "company_name": company_name,
+            "contact_person": contact_person,
+            "phone_number": phone_number,
+            # 使用新的精确提取函数
+            "extracted_data": extract_all_conversation_data(analysis_result["analysis"])
+        })
+    return call_fields
+
+def summarize_conversions(analysis_results: list) -> dict:
+    """
+    一次遍历分析结果，统计文件转换状态并收集转换成功的文件详情
+
+    Args:
+        analysis_results: process_all_files返回的分析结果列表
+
+    Returns:
+        dict: 包含以下键
+            counts: 总文件数、转换成功、转换失败、无需转换的数量
+            converted_files: 转换成功的文件详情列表
+    """
+    counts = {"total": 0, "converted": 0, "failed": 0, "no_conversion": 0}
+    converted_files = []
+
+    for res in analysis_results:
+        if res["status"] == "success":
+            counts["total"] += 1
+            conversion_info = res.get("conversion_info")
+            if conversion_info is not None:
+                if conversion_info.get("conversion_success", False):
+                    counts["converted"] += 1
+                    converted_files.append({
+                        "filename": os.path.basename(res["file_path"]),
+                        "original_size": conversion_info["original_size_bytes"],
+                        "converted_size": conversion_info["converted_size_bytes"],
+                        "duration": conversion_info["converted_duration_seconds"]
+                    })
+                else:
+                    counts["failed"] += 1
+            else:
+                counts["no_conversion"] += 1
+
+    return {"counts": counts, "converted_files": converted_files}
+
+def serialize_report_rows(analysis_results: list, call_fields: list) -> str:
+    """
+    将生成Excel报告所需的数据序列化为JSON字符串，作为报告缓存的键
+
+    Args:
+        analysis_results: process_all_files返回的分析结果列表
+        call_fields: derive_call_fields的返回结果
+
+    Returns:
+        str: 排序键后的JSON字符串
+    """
+    return json.dumps({
+        "total_calls": sum(1 for res in analysis_results if res["status"] == "success"),
+        "rows": [
+            {
+                "company_name": fields["company_name"],
+                "contact_person": fields["contact_person"],
+                "phone_number": fields["phone_number"],
+                "score": fields["extracted_data"]["score"],
+                "suggestion": fields["extracted_data"]["suggestion"]
+            }
+            for fields in call_fields if fields is not None
+        ]
+    }, ensure_ascii=False, sort_keys=True)
+
+@st.cache_resource
+def load_excel_template_bytes() -> bytes:
+    """
+    读取Excel模板文件内容（整个应用进程只读取一次磁盘）
+
+    Returns:
+        bytes: 模板文件的字节数据
+    """
+    with open(EXCEL_CONFIG["template_file"], "rb") as f:
+        return f.read()
+
+@st.cache_resource
+def get_excel_template_layout() -> dict:
+    """
+    扫描Excel模板，定位需要填写的列和行（模板固定不变，整个应用进程只扫描一次）
+
+    Returns:
+        dict: 包含以下键
+            column_indices: 表头名称 -> 列号
+            max_row: 模板的最大行号
+            daily_calls_row: "该日电话数"所在行（未找到为None）
+            summary_row: "总结"所在行（未找到时使用配置中的默认行）
+            total_score_col: 总结行中"总评分"所在列（未找到为None）
+    """
+    workbook = openpyxl.load_workbook(BytesIO(load_excel_template_bytes()))
+    worksheet = workbook.active
+
+    # 查找表格中的列
+    column_indices = {}
+    for col in range(1, worksheet.max_column + 1):
+        header = worksheet.cell(1, col).value
+        if header:
+            column_indices[header] = col
+
+    # 寻找"该日电话数"和"总结"所在行
+    daily_calls_row = None
+    summary_row = None
+    for row in range(1, worksheet.max_row + 1):
+        cell_value = worksheet.cell(row, 1).value
+        if not cell_value:
+            continue
+        if daily_calls_row is None and "该日电话数" in str(cell_value):
+            daily_calls_row = row
+        if summary_row is None and "总结" in str(cell_value):
+            summary_row = row
+
+    if not summary_row:
+        # 如果没找到，默认使用第33行
+        summary_row = EXCEL_CONFIG["summary_row"]
+
+    # 查找总评分列
+    total_score_col = None
+    for col in range(1, worksheet.max_column + 1):
+        cell_value = worksheet.cell(summary_row, col).value
+        if cell_value and "总评分" in str(cell_value):
+            total_score_col = col
+            break
+
+    return {
+        "column_indices": column_indices,
+        "max_row": worksheet.max_row,
+        "daily_calls_row": daily_calls_row,
+        "summary_row": summary_row,
+        "total_score_col": total_score_col
+    }
+
+# 限制缓存的报告数量，避免多次分析后生成的Excel文件在内存中持续累积
+@st.cache_data(show_spinner=False, max_entries=20)
+def build_excel_report(report_json: str, summary_analysis: str, today_date: str) -> tuple:
+    """
+    根据分析结果填写电话开拓分析表模板
+
+    相同的分析结果只会生成一次，之后页面重新运行时直接返回缓存的文件内容
+
+    Args:
+        report_json: serialize_report_rows生成的JSON字符串
+        summary_analysis: 汇总分析文本
+        today_date: 文件名中使用的日期（YYYYMMDD）
+
+    Returns:
+        tuple: (Excel文件字节数据, 文件名)
+    """
+    report = json.loads(report_json)
+    workbook = openpyxl.load_workbook(BytesIO(load_excel_template_bytes()))
+    worksheet = workbook.active
+    layout = get_excel_template_layout()
+    column_indices = layout["column_indices"]
+    # 文件名解析和评分提取已在derive_call_fields中完成
+    report_rows = report["rows"]
+
+    # 需要填写的列号在循环外取一次（模板中没有的列为None）
+    name_col = column_indices.get("客户名称")
+    contact_col = column_indices.get("联系人")
+    phone_col = column_indices.get("联系电话")
+    score_col = column_indices.get("评分")
+    suggestion_col = column_indices.get("通话优化建议")
+    target_cols = [col for col in (name_col, contact_col, phone_col, score_col, suggestion_col) if col]
+
+    # 填写数据到表格中（从第2行开始，不超过模板的最大行）
+    rows_to_write = report_rows[:max(layout["max_row"] - 1, 0)]
+    if rows_to_write and target_cols:
+        # 一次取出所有待填写行中目标列范围内的单元格，逐行按下标直接写入，
+        # 避免每个单元格单独调用worksheet.cell，也不读取目标列范围之外的单元格
+        first_col = min(target_cols)
+        row_cells_iter = worksheet.iter_rows(
+            min_row=2,
+            max_row=1 + len(rows_to_write),
+            min_col=first_col,
+            max_col=max(target_cols)
+        )
+        # 列号换算为行内下标（模板中没有的列为None）
+        name_idx = name_col - first_col if name_col else None
+        contact_idx = contact_col - first_col if contact_col else None
+        phone_idx = phone_col - first_col if phone_col else None
+        score_idx = score_col - first_col if score_col else None
+        suggestion_idx = suggestion_col - first_col if suggestion_col else None
+
+        for row_cells, data in zip(row_cells_iter, rows_to_write):
+            if name_idx is not None:
+                row_cells[name_idx].value = data["company_name"]
+            if contact_idx is not None:
+                row_cells[contact_idx].value = data["contact_person"]
+            if phone_idx is not None and data["phone_number"]:
+                row_cells[phone_idx].value = data["phone_number"]
+            if score_idx is not None and data["score"]:
+                # 提取到的总分是纯数字字符串，按整数写入；其他内容原样写入
+                score_text = data["score"]
+                row_cells[score_idx].value = int(score_text) if score_text.isdecimal() else score_text
+            if suggestion_idx is not None and data["suggestion"]:
+                row_cells[suggestion_idx].value = data["suggestion"]
+
+    # 填写该日电话数
+    total_calls = report["total_calls"]
+    if layout["daily_calls_row"]:
+        # 假设CDEF合并单元格在第3列开始
+        worksheet.cell(layout["daily_calls_row"], 3).value = total_calls
+
+    # 处理总结部分
+    if summary_analysis:
+        # 使用新的精确提取函数
+        summary_data = extract_all_summary_data(summary_analysis)
+        avg_score = summary_data["average_score"]
+        improvement_measures = summary_data["improvement_measures"]
+
+        # 总结行和总评分列来自模板布局
+        summary_row = layout["summary_row"]
+        total_score_col = layout["total_score_col"]
+
+        # 既没有改进措施也没有平均分时，总结部分保持模板原样，不写入占位内容
+        if improvement_measures or avg_score:
+            # 格式化改进措施
+            if improvement_measures:
+                formatted_suggestions = "改进建议：\n"
+                for measure in improvement_measures:
+                    formatted_suggestions += f"- {measure}\n"
+            else:
+                # 如果没有提取到措施，提示查看详细报告
+                formatted_suggestions = "改进建议：\n- 请查看详细分析报告"
+
+            suggestion_cell = worksheet.cell(summary_row, 2)
+            suggestion_cell.value = formatted_suggestions
+            # 设置改进建议单元格对齐方式：顶部对齐 + 自动换行
+            suggestion_cell.alignment = SUMMARY_CELL_ALIGNMENT
+
+        if total_score_col and avg_score:
+            score_cell = worksheet.cell(summary_row, total_score_col)
+            score_cell.value = f"总评分：\n{avg_score}"
+            # 设置单元格对齐方式：顶部对齐 + 自动换行
+            score_cell.alignment = SUMMARY_CELL_ALIGNMENT
+
+    # 获取第一个文件的联系人名称，如果没有则使用默认值
+    first_contact = report_rows[0]["contact_person"] if report_rows and report_rows[0]["contact_person"] else "未知联系人"
+
+    # 生成文件名
+    excel_filename = f"电话开拓分析表_{first_contact}_{today_date}.xlsx"
+
+    # 保存到内存中
+    excel_buffer = BytesIO()
+    workbook.save(excel_buffer)
+    return excel_buffer.getvalue(), excel_filename
+
 # 仅在第一次加载页面且教程未显示过时显示教程
 if not st.session_state.tutorial_shown:
     tutorial()
@@ -143,9 +659,12 @@ st.markdown("### 🙋🏻‍♂️ 请选择您的姓名")
 
 # 获取销售人员列表
 try:
-    # 每次调用都创建新的数据库管理器实例，避免协程重用
-    salespersons = get_db_manager().get_salespersons()
-    salesperson_names = ["请选择..."] + [sp['name'] for sp in salespersons]
+    salespersons = load_salespersons()
+    salespersons_by_name = {}
+    for sp in salespersons:
+        # 重名时与原来一样取第一个
+        salespersons_by_name.setdefault(sp['name'], sp)
+    salesperson_names = ["请选择..."] + list(salespersons_by_name)
     
     # 销售人员下拉选择框
     selected_name = st.selectbox(
@@ -155,10 +674,15 @@ try:
         help="请从下拉列表中选择您的姓名"
     )
     
+    # 销售人员列表有缓存，新增人员后可手动刷新
+    if st.button("🔄 刷新列表", key="refresh_salespersons", help="重新从数据库加载销售人员列表"):
+        load_salespersons.clear()
+        st.rerun()
+    
     # 如果选择了有效的销售人员
     if selected_name != "请选择...":
         # 查找对应的销售人员ID
-        selected_person = next((sp for sp in salespersons if sp['name'] == selected_name), None)
+        selected_person = salespersons_by_name.get(selected_name)
         if selected_person:
             st.session_state.salesperson_id = selected_person['id']
             st.session_state.salesperson_name = selected_person['name']
@@ -236,14 +760,9 @@ if uploaded_files and not st.session_state.analysis_completed:
     # 🔍 重复文件检测
     try:
         # 提取文件名列表
-        filenames = [file.name for file in uploaded_files]
+        filenames = tuple(file.name for file in uploaded_files)
         
-        # 每次调用都创建新的数据库管理器实例，避免协程重用
-        duplicate_check = get_db_manager().check_duplicate_filenames(
-            st.session_state.salesperson_id, 
-            filenames,
-            days_back=30  # 检测最近30天
-        )
+        duplicate_check = find_duplicate_uploads(st.session_state.salesperson_id, filenames)
         
         # 显示检测结果
         if duplicate_check["duplicates"] or duplicate_check["new_files"]:
@@ -297,11 +816,7 @@ if uploaded_files and not st.session_state.analysis_completed:
     today = date.today()
     
     try:
-        # 每次调用都创建新的数据库管理器实例，避免协程重用
-        has_existing_record = get_db_manager().check_daily_record_exists(
-            st.session_state.salesperson_id, 
-            today
-        )
+        has_existing_record = has_daily_record(st.session_state.salesperson_id, today.isoformat())
         
         if has_existing_record and st.session_state.upload_choice is None:
             st.warning(f"⚠️ {st.session_state.salesperson_name} 今天已有上传记录")
@@ -328,83 +843,70 @@ if uploaded_files and not st.session_state.analysis_completed:
             if st.button("开始分析", key="start_analysis"):
                 with st.spinner("正在处理文件..."):
                     progress_placeholder = st.empty()
-                    # 保存上传的文件到临时文件夹
-                    temp_files = []
-                    for uploaded_file in uploaded_files:
-                        # 确保临时文件夹存在
-                        os.makedirs("temp", exist_ok=True)
-                        temp_path = os.path.join("temp", f"temp_{uploaded_file.name}")
-                        with open(temp_path, "wb") as f:
-                            f.write(uploaded_file.getbuffer())
-                        temp_files.append(temp_path)
+                    temp_dir = None
 
                     try:
+                        # 保存上传的文件到本次分析独享的临时文件夹，多个会话同时分析同名文件时互不覆盖
+                        temp_dir = tempfile.TemporaryDirectory(prefix="callan_")
+                        temp_files = save_uploaded_files(uploaded_files, temp_dir.name)
+
                         results = run_async_process(process_all_files(temp_files, progress_placeholder))
                         st.session_state.analysis_results = results
+                        st.session_state.call_fields = derive_call_fields(results)
+                        st.session_state.conversion_summary = summarize_conversions(results)
+                        st.session_state.rendered_conversations = None
+                        st.session_state.excel_report = None
 
                         # 生成汇总分析并保存，同时更新进度条（汇总分析占 20%）
                         phase_text = progress_placeholder.empty()
                         phase_text.markdown("**🔄 正在生成汇总分析...**")
                         progress_bar = progress_placeholder.progress(0.9)
-                        st.session_state.summary_analysis = analyze_summary([res for res in results if res["status"] == "success"])
+                        st.session_state.summary_analysis = cached_analyze_summary([res for res in results if res["status"] == "success"])
                         progress_bar.progress(1.0)
                         phase_text.markdown("**✅ 所有文件处理完成！**")
 
-                        # 生成完整报告并保存
-                        combined_report = ""
-                        for idx, res in enumerate(results, 1):
-                            if res["status"] == "success" and res["analysis_result"].get("status") == "success":
-                                combined_report += f"\n\n{'=' * 50}\n对话记录 {idx}：\n{'=' * 50}\n\n"
-                                combined_report += res["analysis_result"]["formatted_text"]
-                                combined_report += f"\n\n{'=' * 50}\n分析结果 {idx}：\n{'=' * 50}\n\n"
-                                combined_report += res["analysis_result"]["analysis"]
-
-                        combined_report += f"\n\n{'=' * 50}\n汇总分析报告：\n{'=' * 50}\n\n"
-                        combined_report += st.session_state.summary_analysis
-                        st.session_state.combined_report = combined_report
+                        # 生成完整报告的各个片段并保存
+                        # 片段大多直接引用分析结果中的文本，会话中不再另存一份拼接好的完整副本
+                        report_parts = []
+                        for idx, (res, fields) in enumerate(zip(results, st.session_state.call_fields), 1):
+                            if fields is not None:
+                                analysis_result = res["analysis_result"]
+                                report_parts.append(f"\n\n{REPORT_SEPARATOR}\n对话记录 {idx}：\n{REPORT_SEPARATOR}\n\n")
+                                report_parts.append(analysis_result["formatted_text"])
+                                report_parts.append(f"\n\n{REPORT_SEPARATOR}\n分析结果 {idx}：\n{REPORT_SEPARATOR}\n\n")
+                                report_parts.append(analysis_result["analysis"])
+
+                        report_parts.append(f"\n\n{REPORT_SEPARATOR}\n汇总分析报告：\n{REPORT_SEPARATOR}\n\n")
+                        report_parts.append(st.session_state.summary_analysis)
+                        st.session_state.report_parts = report_parts
                         
                         # 保存分析结果到数据库
                         phase_text.markdown("**💾 正在保存分析结果到数据库...**")
                         try:
                             # 准备数据
                             call_details_list = []
-                            for res in results:
-                                if res["status"] == "success" and res["analysis_result"].get("status") == "success":
-                                    # 解析文件名
-                                    file_name = os.path.basename(res["file_path"])
-                                    file_name = re.sub(r'^temp_', '', file_name)
-                                    file_name_without_ext = os.path.splitext(file_name)[0]
-                                    
-                                    # 使用智能文件名解析
-                                    company_name, contact_person, phone_number = parse_filename_intelligently(file_name_without_ext)
+                            for res, fields in zip(results, st.session_state.call_fields):
+                                if fields is not None:
+                                    analysis_result = res["analysis_result"]
+                                    # 文件名解析和分析数据提取已在derive_call_fields中完成
+                                    file_name = fields["file_name"]
+                                    company_name = fields["company_name"]
+                                    contact_person = fields["contact_person"]
+                                    phone_number = fields["phone_number"]
+                                    extracted_data = fields["extracted_data"]
                                     
                                     # 获取对话文本
-                                    conversation_text = res["analysis_result"]["formatted_text"]
-                                    
-                                    # 提取分析数据
-                                    analysis_text = res["analysis_result"]["analysis"]
-                                    extracted_data = extract_all_conversation_data(analysis_text)
+                                    conversation_text = analysis_result["formatted_text"]
+                                    analysis_text = analysis_result["analysis"]
                                     
                                     # 正确获取评分（用于统计，不用于有效性判断）
-                                    score = None
-                                    if extracted_data["score"]:
-                                        try:
-                                            score = float(extracted_data["score"])
-                                        except ValueError:
-                                            pass
+                                    score_text = extracted_data["score"]
+                                    score = float(score_text) if score_text and score_text.isdecimal() else None
                                     
                                     # 🚀 修复：使用正确的时间判断逻辑（>= 60秒）
                                     # 从 Audio_Recognition.py 的结果中获取已经计算好的 is_valid_call
                                     is_effective = res.get("is_valid_call", False)
                                     
-                                    # 准备分析结果的JSON格式
-                                    analysis_result_json = {
-                                        "roles": res["analysis_result"].get("roles", {}),
-                                        "analysis": analysis_text,
-                                        "extracted_data": extracted_data,
-                                        "suggestions": extracted_data["suggestion"]
-                                    }
-                                    
                                     # 准备单条通话详情（使用新字段名）
                                     call_detail = {
                                         'original_filename': file_name,
@@ -427,6 +929,9 @@ if uploaded_files and not st.session_state.analysis_completed:
                                 st.session_state.summary_analysis,
                                 st.session_state.upload_choice
                             )
+                            # 今日记录和已上传文件已变化，下次运行重新查询
+                            has_daily_record.clear()
+                            find_duplicate_uploads.clear()
                             
                             if save_success:
                                 phase_text.markdown("**✅ 分析结果已成功保存到数据库！**")
@@ -441,33 +946,9 @@ if uploaded_files and not st.session_state.analysis_completed:
                     except Exception as e:
                         st.error(f"处理过程中出现错误：{str(e)}")
                     finally:
-                        # 清理临时文件
-                        for temp_file in temp_files:
-                            if os.path.exists(temp_file):
-                                os.remove(temp_file)
-                        # 清理转换生成的临时文件（保留有价值的转换文件信息）
-                        converted_files_to_cleanup = []
-                        for res in results:
-                            if res["status"] == "success" and "conversion_info" in res:
-                                conversion_info = res["conversion_info"]
-                                if conversion_info.get("conversion_success", False):
-                                    converted_file_path = conversion_info.get("converted_file_path")
-                                    if converted_file_path and os.path.exists(converted_file_path):
-                                        converted_files_to_cleanup.append(converted_file_path)
-                        
-                        # 延迟清理转换文件，给用户查看的时间
-                        if converted_files_to_cleanup:
-                            logging.info(f"发现 {len(converted_files_to_cleanup)} 个转换文件，将在session结束时清理")
-                            # 将转换文件列表保存到session state中，用于后续清理
-                            if 'converted_files_cleanup' not in st.session_state:
-                                st.session_state.converted_files_cleanup = []
-                            st.session_state.converted_files_cleanup.extend(converted_files_to_cleanup)
-                        
-                        # 尝试删除临时文件夹（只删除空文件夹）
-                        try:
-                            os.rmdir("temp")
-                        except OSError:
-                            pass  # 如果文件夹不为空或不存在，忽略错误
+                        # 一次删除整个临时文件夹，上传文件和转换生成的文件都在其中
+                        if temp_dir is not None:
+                            temp_dir.cleanup()
 
     except Exception as e:
         st.error(f"检查数据库记录时出错：{str(e)}")
@@ -487,11 +968,7 @@ if uploaded_images and not st.session_state.analysis_completed:
     today = date.today()
     
     try:
-        # 每次调用都创建新的数据库管理器实例，避免协程重用
-        has_existing_record = get_db_manager().check_daily_record_exists(
-            st.session_state.salesperson_id, 
-            today
-        )
+        has_existing_record = has_daily_record(st.session_state.salesperson_id, today.isoformat())
         
         if has_existing_record and st.session_state.upload_choice is None:
             st.warning(f"⚠️ {st.session_state.salesperson_name} 今天已有上传记录")
@@ -610,17 +1087,9 @@ if uploaded_images and not st.session_state.analysis_completed:
                                         progress_placeholder.markdown(f"**{message}**")
                                     
                                     # 处理图片批次（使用过滤后的图片列表）
-                                    def run_image_process():
-                                        loop = asyncio.new_event_loop()
-                                        asyncio.set_event_loop(loop)
-                                        try:
-                                            return loop.run_until_complete(
-                                                process_image_batch(filtered_images, update_progress)
-                                            )
-                                        finally:
-                                            loop.close()
-                                    
-                                    processing_results = run_image_process()
+                                    processing_results = run_async_process(
+                                        process_image_batch(filtered_images, update_progress)
+                                    )
                                     
                                     # 🤖 第二层去重检查：智能内容去重
                                     if processing_results.get('all_calls') and len(processing_results['all_calls']) > 0:
@@ -693,6 +1162,9 @@ if uploaded_images and not st.session_state.analysis_completed:
                                             db_update_data,
                                             st.session_state.upload_choice
                                         )
+                                        # 今日记录和已上传文件已变化，下次运行重新查询
+                                        has_daily_record.clear()
+                                        find_duplicate_uploads.clear()
                                         
                                         if save_success:
                                             progress_placeholder.markdown("**✅ 图片识别结果已成功保存到数据库！**")
@@ -726,27 +1198,22 @@ if uploaded_images and not st.session_state.analysis_completed:
     except Exception as e:
         st.error(f"检查数据库记录时出错：{str(e)}")
 
-if st.session_state.analysis_results:
-    # 显示整体转换状态
-    conversion_summary = {"total": 0, "converted": 0, "failed": 0, "no_conversion": 0}
-    converted_files_info = []
-    
-    for res in st.session_state.analysis_results:
-        if res["status"] == "success":
-            conversion_summary["total"] += 1
-            if "conversion_info" in res:
-                if res["conversion_info"].get("conversion_success", False):
-                    conversion_summary["converted"] += 1
-                    converted_files_info.append({
-                        "filename": os.path.basename(res["file_path"]),
-                        "original_size": res["conversion_info"]["original_size_bytes"],
-                        "converted_size": res["conversion_info"]["converted_size_bytes"],
-                        "duration": res["conversion_info"]["converted_duration_seconds"]
-                    })
-                else:
-                    conversion_summary["failed"] += 1
-            else:
-                conversion_summary["no_conversion"] += 1
+@st.fragment
+def render_analysis_results():
+    """
+    显示录音分析结果、转换状态和下载按钮
+
+    作为fragment运行：点击其中的下载按钮等控件时只重新运行这一部分，不会重跑整个页面
+    """
+    analysis_results = st.session_state.analysis_results
+    if st.session_state.call_fields is None:
+        st.session_state.call_fields = derive_call_fields(analysis_results)
+
+    # 显示整体转换状态（统计在分析完成时计算一次）
+    if st.session_state.conversion_summary is None:
+        st.session_state.conversion_summary = summarize_conversions(analysis_results)
+    conversion_summary = st.session_state.conversion_summary["counts"]
+    converted_files_info = st.session_state.conversion_summary["converted_files"]
     
     # 显示转换摘要
     if conversion_summary["converted"] > 0 or conversion_summary["failed"] > 0:
@@ -775,18 +1242,20 @@ if st.session_state.analysis_results:
                     st.markdown(f"   - 转换后大小: {file_info['converted_size']:,} 字节 {change_color} {change_text}")
                     st.markdown(f"   - 音频时长: {file_info['duration']:.2f} 秒")
         
-        if conversion_summary["converted"] > 0:
-            st.info("💡 转换后的文件已保留供验证，将在程序结束时自动清理")
-        
         st.markdown("---")
     
     tab1, tab2, tab3 = st.tabs(["📝 所有对话记录", "📊 所有分析结果", "📈 汇总分析"])
 
     with tab1:
-        for idx, res in enumerate(st.session_state.analysis_results, 1):
+        # 对话内容只在分析完成后渲染一次，之后页面重新运行时直接复用
+        if st.session_state.rendered_conversations is None:
+            st.session_state.rendered_conversations = render_conversations(analysis_results, st.session_state.call_fields)
+
+        for idx, (res, rendered) in enumerate(zip(analysis_results,
+                                                  st.session_state.rendered_conversations), 1):
             if res["status"] == "success":
                 analysis_result = res["analysis_result"]
-                if analysis_result.get("status") == "success":
+                if rendered is not None:
                     st.markdown(f"### 📝 对话记录 {idx}")
                     
                     # 显示转换文件信息（如果有）
@@ -797,12 +1266,10 @@ if st.session_state.analysis_results:
                                 col1, col2 = st.columns(2)
                                 with col1:
                                     st.markdown("**原始文件：**")
-                                    st.markdown(f"- 文件路径: `{conversion_info['original_file_path']}`")
                                     st.markdown(f"- 文件大小: {conversion_info['original_size_bytes']:,} 字节")
                                     
                                 with col2:
                                     st.markdown("**转换后文件：**")
-                                    st.markdown(f"- 文件路径: `{conversion_info['converted_file_path']}`")
                                     st.markdown(f"- 文件大小: {conversion_info['converted_size_bytes']:,} 字节")
                                     st.markdown(f"- 音频时长: {conversion_info['converted_duration_seconds']:.2f} 秒")
                                     st.markdown(f"- 音频格式: {conversion_info['converted_format']}")
@@ -820,22 +1287,14 @@ if st.session_state.analysis_results:
                     
                     if analysis_result["roles"].get("confidence", "low") != "high":
                         st.warning("⚠️ 该对话的角色识别可信度不高，请核实。")
-                    st.markdown(f"**角色说明：**")
-                    st.markdown(f"- 说话者1 ({analysis_result['roles']['spk1']})")
-                    st.markdown(f"- 说话者2 ({analysis_result['roles']['spk2']})")
-                    st.markdown("**详细对话：**")
-                    st.markdown(analysis_result["formatted_text"])
-                    st.markdown("---")
+                    st.markdown(rendered)
 
     with tab2:
-        for idx, res in enumerate(st.session_state.analysis_results, 1):
+        for idx, (res, fields) in enumerate(zip(analysis_results, st.session_state.call_fields), 1):
             if res["status"] == "success":
                 analysis_result = res.get("analysis_result", {})
-                if analysis_result.get("status") == "success":
-                    file_name = os.path.basename(res["file_path"])
-                    file_name = re.sub(r'^temp_', '', file_name)
-                    file_name = os.path.splitext(file_name)[0]
-                    with st.expander(f"📊 {file_name} 通话分析"):
+                if fields is not None:
+                    with st.expander(f"📊 {fields['display_name']} 通话分析"):
                         st.markdown(analysis_result["analysis"])
                         st.markdown("---")
                 else:
@@ -849,157 +1308,27 @@ if st.session_state.analysis_results:
     with col1:
         st.download_button(
             label="📥 下载完整分析报告",
-            data=st.session_state.combined_report,
+            data="".join(st.session_state.report_parts),
             file_name="complete_analysis_report.md",
             mime="text/plain"
         )
 
     with col2:
-        excel_filename = "电话开拓分析表_未知联系人.xlsx"  # 默认文件名
-        
-        def generate_excel_report():
+        # 报告内容只取决于分析结果、汇总分析和日期，交给缓存函数生成；
+        # 生成后保存在会话中，切换标签页等重新运行时不再序列化分析结果
+        if st.session_state.excel_report is None:
             try:
-                workbook = openpyxl.load_workbook(EXCEL_CONFIG["template_file"])
-                worksheet = workbook.active
-                file_names = []
-                contact_persons = []
-                analysis_data = []
-                for res in st.session_state.analysis_results:
-                    if res["status"] == "success" and res["analysis_result"].get("status") == "success":
-                        file_name = os.path.basename(res["file_path"])
-                        file_name = re.sub(r'^temp_', '', file_name)
-                        file_name = os.path.splitext(file_name)[0]
-                        
-                        # 使用智能文件名解析
-                        company_name, contact_person, phone_number = parse_filename_intelligently(file_name)
-                        
-                        file_names.append(company_name)
-                        contact_persons.append(contact_person)
-                        
-                        # 使用新的精确提取函数
-                        analysis_text = res["analysis_result"]["analysis"]
-                        extracted_data = extract_all_conversation_data(analysis_text)
-                        
-                        analysis_data.append({
-                            "score": extracted_data["score"], 
-                            "suggestion": extracted_data["suggestion"], 
-                            "phone_number": phone_number,
-                            "contact_person": contact_person
-                        })
-                
-                # 查找表格中的列
-                column_indices = {}
-                for col in range(1, worksheet.max_column + 1):
-                    header = worksheet.cell(1, col).value
-                    if header:
-                        column_indices[header] = col
-                
-                # 填写数据到表格中
-                for i, (name, data) in enumerate(zip(file_names, analysis_data)):
-                    row = i + 2
-                    if row <= worksheet.max_row:
-                        if "客户名称" in column_indices:
-                            worksheet.cell(row, column_indices["客户名称"]).value = name
-                        if "联系人" in column_indices:
-                            worksheet.cell(row, column_indices["联系人"]).value = data["contact_person"]
-                        if "联系电话" in column_indices and data["phone_number"]:
-                            worksheet.cell(row, column_indices["联系电话"]).value = data["phone_number"]
-                        if "评分" in column_indices and data["score"]:
-                            try:
-                                worksheet.cell(row, column_indices["评分"]).value = int(data["score"])
-                            except ValueError:
-                                worksheet.cell(row, column_indices["评分"]).value = data["score"]
-                        if "通话优化建议" in column_indices and data["suggestion"]:
-                            worksheet.cell(row, column_indices["通话优化建议"]).value = data["suggestion"]
-                
-                # 填写该日电话数
-                total_calls = len([res for res in st.session_state.analysis_results if res["status"] == "success"])
-                # 寻找"该日电话数"单元格
-                for row in range(1, worksheet.max_row + 1):
-                    cell_value = worksheet.cell(row, 1).value
-                    if cell_value and "该日电话数" in str(cell_value):
-                        # 假设CDEF合并单元格在第3列开始
-                        worksheet.cell(row, 3).value = total_calls
-                        break
-                
-                # 处理总结部分
-                if st.session_state.summary_analysis:
-                    # 使用新的精确提取函数
-                    summary_data = extract_all_summary_data(st.session_state.summary_analysis)
-                    avg_score = summary_data["average_score"]
-                    improvement_measures = summary_data["improvement_measures"]
-                    
-                    # 格式化改进措施
-                    formatted_suggestions = ""
-                    if improvement_measures:
-                        formatted_suggestions = "改进建议：\n"
-                        for measure in improvement_measures:
-                            formatted_suggestions += f"- {measure}\n"
-                    else:
-                        # 如果没有提取到措施，使用原始内容的前几行作为备选
-                        formatted_suggestions = "改进建议：\n- 请查看详细分析报告"
-                    
-                    # 找到总结行
-                    summary_row = None
-                    for row in range(1, worksheet.max_row + 1):
-                        cell_value = worksheet.cell(row, 1).value
-                        if cell_value and "总结" in str(cell_value):
-                            summary_row = row
-                            break
-                    
-                    if not summary_row:
-                        # 如果没找到，默认使用第33行
-                        summary_row = EXCEL_CONFIG["summary_row"]
-                    
-                    if formatted_suggestions:
-                        worksheet.cell(summary_row, 2).value = formatted_suggestions
-                        # 设置改进建议单元格对齐方式：顶部对齐 + 自动换行
-                        worksheet.cell(summary_row, 2).alignment = openpyxl.styles.Alignment(
-                            wrapText=True, 
-                            vertical='top',
-                            horizontal='left'
-                        )
-                    
-                    # 查找总评分列
-                    total_score_col = None
-                    for col in range(1, worksheet.max_column + 1):
-                        cell_value = worksheet.cell(summary_row, col).value
-                        if cell_value and "总评分" in str(cell_value):
-                            total_score_col = col
-                            break
-                    
-                    if total_score_col and avg_score:
-                        worksheet.cell(summary_row, total_score_col).value = f"总评分：\n{avg_score}"
-                        # 设置单元格对齐方式：顶部对齐 + 自动换行
-                        worksheet.cell(summary_row, total_score_col).alignment = openpyxl.styles.Alignment(
-                            wrapText=True, 
-                            vertical='top',
-                            horizontal='left'
-                        )
-                
-                # 获取第一个文件的联系人名称，如果没有则使用默认值
-                first_contact = contact_persons[0] if contact_persons and contact_persons[0] else "未知联系人"
-                
-                # 获取当前日期
-                from datetime import datetime
-                today_date = datetime.now().strftime("%Y%m%d")
-                
-                # 生成文件名
-                global excel_filename
-                excel_filename = f"电话开拓分析表_{first_contact}_{today_date}.xlsx"
-                
-                # 保存到内存中
-                excel_buffer = BytesIO()
-                workbook.save(excel_buffer)
-                excel_buffer.seek(0)
-                return excel_buffer
+                st.session_state.excel_report = build_excel_report(
+                    serialize_report_rows(analysis_results, st.session_state.call_fields),
+                    st.session_state.summary_analysis,
+                    date.today().strftime("%Y%m%d")
+                )
             except Exception as e:
                 logging.error(f"生成Excel报告时出错: {e}")
                 st.error(f"生成Excel报告时出错: {e}")
-                return None
 
-        excel_data = generate_excel_report()
-        if excel_data:
+        if st.session_state.excel_report:
+            excel_data, excel_filename = st.session_state.excel_report
             st.download_button(
                 label="📊 下载电话开拓分析表",
                 data=excel_data,
@@ -1007,6 +1336,21 @@ if st.session_state.analysis_results:
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             )
 
+    # 清除本次分析结果，释放会话中保存的分析文本和报告
+    if st.button("🧹 清除分析结果", help="清除本次分析结果，以便重新上传文件进行分析"):
+        st.session_state.analysis_results = None
+        st.session_state.call_fields = None
+        st.session_state.conversion_summary = None
+        st.session_state.rendered_conversations = None
+        st.session_state.excel_report = None
+        st.session_state.report_parts = None
+        st.session_state.summary_analysis = None
+        st.session_state.analysis_completed = False
+        st.rerun()
+
+if st.session_state.analysis_results:
+    render_analysis_results()
+
 # 显示图片识别结果（新增）
 elif hasattr(st.session_state, 'image_analysis_results') and st.session_state.image_analysis_results:
     st.markdown("### 📸 图片识别结果")